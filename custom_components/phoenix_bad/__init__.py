@@ -2,14 +2,30 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-
-from .const import DOMAIN, PLATFORMS
-from .coordinator import PhoenixBadCoordinator
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+
+from .api import AREAS, PhoenixBadApiClient
+from .const import (
+    CONF_BLOCKING_FIRST_REFRESH,
+    DEFAULT_BLOCKING_FIRST_REFRESH,
+    DOMAIN,
+    PLATFORMS,
+)
+from .coordinator import PhoenixBadCoordinator, PhoenixBadRuntimeData
+from .scheduler import AdaptiveScheduler, install_phase
+from .services import async_setup_services
+from .storage import (
+    OccupancyForecastStore,
+    OccupancyHistoryWriter,
+    OccupancySnapshotStore,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -17,26 +33,109 @@ _LOGGER = logging.getLogger(__name__)
 async def async_setup(hass: HomeAssistant, config: dict):  # pylint: disable=unused-argument
     """Set up Phönix-Bad integration."""
     _LOGGER.debug("Phönix-Bad integration setup called.")
+    async_setup_services(hass)
     return True
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up Phönix-Bad from a config entry."""
     _LOGGER.debug("Setting up Phönix-Bad entry with entry_id: %s", entry.entry_id)
-
-    session = async_get_clientsession(hass)
-    coordinator = PhoenixBadCoordinator(hass, session)
+    setup_started = time.perf_counter()
+
+    # A dedicated session on HA's shared connector, so request phase
+    # timings can be traced without touching the global session.
+    session = async_create_clientsession(
+        hass, trace_configs=[PhoenixBadApiClient.trace_config()]
+    )
+    entry.async_on_unload(session.close)
+    api = PhoenixBadApiClient(session=session)
+    snapshot_store = OccupancySnapshotStore(hass, entry.entry_id)
+    snapshot = await snapshot_store.async_load()
+    history = OccupancyHistoryWriter(hass, entry.entry_id, AREAS)
+    entry.async_on_unload(history.async_start())
+    # Write what is still buffered when the entry goes away or HA stops
+    entry.async_on_unload(history.async_flush)
+
+    async def _async_flush_history(event: Event) -> None:
+        await history.async_flush()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_FINAL_WRITE, _async_flush_history
+        )
+    )
+
+    forecast_store = OccupancyForecastStore(hass, entry.entry_id)
+    await forecast_store.async_load()
+
+    runtime_data = PhoenixBadRuntimeData(
+        api=api, coordinators={}, history=history, forecast_store=forecast_store
+    )
+    for area in AREAS:
+        coordinator = PhoenixBadCoordinator(
+            hass,
+            session,
+            api=api,
+            snapshot_store=snapshot_store,
+            # Each install and area polls at its own offset in the interval
+            scheduler=AdaptiveScheduler(
+                phase=install_phase(f"{entry.entry_id}:{area.key}")
+            ),
+            areas=(area,),
+            history=history,
+            forecast_store=forecast_store,
+        )
+        # Give entities the last known values right away; they are marked
+        # stale until the live refresh below completes.
+        coordinator.restore(snapshot)
+        runtime_data.coordinators[area.key] = coordinator
+    runtime_data.apply_options(entry.options)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
 
     # Initial fetch
-    await coordinator.async_config_entry_first_refresh()
+    coordinators = runtime_data.coordinators.values()
+    if entry.options.get(CONF_BLOCKING_FIRST_REFRESH, DEFAULT_BLOCKING_FIRST_REFRESH):
+        refresh_started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                coordinator.async_config_entry_first_refresh()
+                for coordinator in coordinators
+            )
+        )
+        runtime_data.startup_timings["first_refresh"] = (
+            time.perf_counter() - refresh_started
+        )
+    else:
+        # Don't hold up HA startup on a slow website; entities show
+        # "unknown" until the first fetch completes.
+        for key, coordinator in runtime_data.coordinators.items():
+            entry.async_create_background_task(
+                hass,
+                coordinator.async_background_first_refresh(),
+                f"{DOMAIN} {key} first refresh",
+            )
 
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    hass.data[DOMAIN][entry.entry_id] = runtime_data
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    runtime_data.startup_timings["setup"] = time.perf_counter() - setup_started
+    _LOGGER.debug(
+        "Phönix-Bad entry set up in %.3fs", runtime_data.startup_timings["setup"]
+    )
     return True
 
 
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options without reloading the entry."""
+    runtime_data: PhoenixBadRuntimeData = hass.data[DOMAIN][entry.entry_id]
+    runtime_data.apply_options(entry.options)
+    # Let the scheduler pick the next interval under the new settings
+    for coordinator in runtime_data.coordinators.values():
+        await coordinator.async_request_refresh()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload Phönix-Bad config entry."""
     _LOGGER.debug("Unloading Phönix-Bad entry with entry_id: %s", entry.entry_id)
@@ -46,3 +145,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove persisted data of a deleted Phönix-Bad config entry."""
+    await OccupancySnapshotStore(hass, entry.entry_id).async_remove()
+    await OccupancyHistoryWriter(hass, entry.entry_id, AREAS).async_remove()
+    await OccupancyForecastStore(hass, entry.entry_id).async_remove()
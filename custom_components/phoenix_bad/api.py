@@ -2,23 +2,72 @@
 
 from __future__ import annotations
 
+from array import array
 import asyncio
+from collections import defaultdict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+import hashlib
 import logging
-import re
+import time
 from typing import Any
+from urllib.parse import quote, urlsplit
 
 import aiohttp
-from bs4 import BeautifulSoup
+
+from .cache import DEFAULT_CACHE_MAX_ENTRIES, ResponseCache
+from .metrics import RequestMetrics, RequestTrace, create_trace_config
+from .resilience import CircuitBreaker, RetryPolicy, TokenBucket
+from .parser import (
+    DEFAULT_PARSER,
+    FALLBACK_PARSER,
+    PARSER_ENGINES,
+    ParserEngine,
+    RawOccupancy,
+    has_occupancy_values,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
-# API endpoints
-POOL_URL = (
-    "https://phoenixbad.de/wp-admin/admin-ajax.php?action=updateLiveVisitors&area=Bad"
-)
-SAUNA_URL = (
-    "https://phoenixbad.de/wp-admin/admin-ajax.php?action=updateLiveVisitors&area=Sauna"
+# API endpoint
+API_URL = "https://phoenixbad.de/wp-admin/admin-ajax.php"
+
+
+@dataclass(frozen=True, slots=True)
+class Area:
+    """Describes an area reported by the updateLiveVisitors endpoint.
+
+    Attributes:
+        key: Identifier used in coordinator data and entity IDs
+        name: Human readable name (also used for logging)
+        query: Value of the area= query parameter
+        icon: Material Design icon for the area's entities
+    """
+
+    key: str
+    name: str
+    query: str
+    icon: str
+
+    @property
+    def url(self) -> str:
+        """Return the API endpoint URL for this area."""
+        return self.url_for(API_URL)
+
+    def url_for(self, api_url: str) -> str:
+        """Return the endpoint URL for this area on the given admin-ajax URL."""
+        return f"{api_url}?action=updateLiveVisitors&area={quote(self.query)}"
+
+
+# Area registry; adding an entry here is all that is needed for a new area
+AREAS: tuple[Area, ...] = (
+    Area(key="pool", name="Pool", query="Bad", icon="mdi:pool"),
+    Area(key="sauna", name="Sauna", query="Sauna", icon="mdi:waves"),
 )
+AREAS_BY_KEY: dict[str, Area] = {area.key: area for area in AREAS}
+
+POOL_URL = AREAS_BY_KEY["pool"].url
+SAUNA_URL = AREAS_BY_KEY["sauna"].url
 
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -29,6 +78,20 @@ DEFAULT_HEADERS = {
 }
 
 DEFAULT_TIMEOUT = 20
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_MAX_BODY_BYTES = 256 * 1024
+READ_CHUNK_SIZE = 4096
+
+# Connection pool settings used when the client owns its session
+DEFAULT_LIMIT_PER_HOST = 4
+DNS_CACHE_TTL = 300
+KEEPALIVE_TIMEOUT = 75
+
+# Requests per second, and burst, allowed per upstream host across every
+# client in the process
+DEFAULT_RATE_LIMIT = 1.0
+DEFAULT_RATE_BURST = 4
+_HOST_BUCKETS: dict[str, TokenBucket] = {}
 
 
 class PhoenixBadApiError(Exception):
@@ -43,21 +106,35 @@ class PhoenixBadParseError(PhoenixBadApiError):
     """Exception raised when parsing API response fails."""
 
 
+class PhoenixBadCircuitOpenError(PhoenixBadConnectionError):
+    """Exception raised when an open circuit breaker rejects a request."""
+
+
+# Fields of OccupancyData that can be given deadbands
+OCCUPANCY_FIELDS = ("free", "occupied", "percentage")
+
+
+@dataclass(frozen=True, slots=True, repr=False)
 class OccupancyData:
-    """Represents occupancy data for an area."""
+    """Represents occupancy data for an area.
 
-    def __init__(self, free: int, occupied: int, percentage: float) -> None:
-        """Initialize occupancy data.
+    Instances are immutable values: they compare and hash by content, so a
+    new sample can be compared cheaply with the previous one.
 
-        Args:
-            free: Number of free spaces
-            occupied: Number of occupied spaces
-            percentage: Occupancy percentage (0-100)
-        """
-        self.free = free
-        self.occupied = occupied
-        self.percentage = percentage
-        self.total = free + occupied
+    Attributes:
+        free: Number of free spaces
+        occupied: Number of occupied spaces
+        percentage: Occupancy percentage (0-100)
+    """
+
+    free: int
+    occupied: int
+    percentage: float
+
+    @property
+    def total(self) -> int:
+        """Return the total number of spaces."""
+        return self.free + self.occupied
 
     def __repr__(self) -> str:
         """Return string representation."""
@@ -66,6 +143,78 @@ class OccupancyData:
             f"percentage={self.percentage:.2f}%)"
         )
 
+    def as_tuple(self) -> tuple[int, int, float]:
+        """Return the sample as a (free, occupied, percentage) tuple."""
+        return (self.free, self.occupied, self.percentage)
+
+    def to_array(self) -> array[float]:
+        """Return the sample as a compact array of doubles."""
+        return array("d", (self.free, self.occupied, self.percentage))
+
+    @classmethod
+    def from_tuple(cls, values: Sequence[float]) -> OccupancyData:
+        """Create a sample from a (free, occupied, percentage) sequence."""
+        free, occupied, percentage = values
+        return cls(int(free), int(occupied), float(percentage))
+
+    def is_close(self, other: OccupancyData, deadbands: Mapping[str, float]) -> bool:
+        """Return whether another sample is within per-field deadbands.
+
+        An area opening or closing is never within the deadband.
+
+        Args:
+            other: Sample to compare with
+            deadbands: Largest ignored absolute change keyed by field name
+                (free, occupied or percentage); missing fields must match
+                exactly
+
+        Returns:
+            True if no field changed by more than its deadband
+        """
+        if (self.total == 0) != (other.total == 0):
+            return False
+        return all(
+            abs(getattr(self, name) - getattr(other, name)) <= deadbands.get(name, 0)
+            for name in OCCUPANCY_FIELDS
+        )
+
+
+@dataclass
+class AreaStats:
+    """Request counters for a single area."""
+
+    requests: int = 0
+    not_modified: int = 0
+    fingerprint_hits: int = 0
+    coalesced: int = 0
+    retries: int = 0
+    circuit_rejections: int = 0
+    bytes_read: int = 0
+    last_bytes_read: int = 0
+    truncated: int = 0
+    throttled: int = 0
+    throttle_seconds: float = 0.0
+
+
+def host_bucket(host: str, rate: float, burst: float) -> TokenBucket:
+    """Return the process-wide token bucket of an upstream host.
+
+    The first client to talk to a host decides its rate and burst; later
+    clients share that bucket, so the limit holds however many config
+    entries or client instances exist.
+
+    Args:
+        host: Host (and port) of the API URL
+        rate: Requests per second for a newly created bucket
+        burst: Burst size for a newly created bucket
+
+    Returns:
+        The token bucket shared by all clients of the host
+    """
+    if (bucket := _HOST_BUCKETS.get(host)) is None:
+        bucket = _HOST_BUCKETS[host] = TokenBucket(rate, burst)
+    return bucket
+
 
 class PhoenixBadApiClient:
     """API client for Phoenix-Bad Ottobrunn."""
@@ -74,21 +223,109 @@ class PhoenixBadApiClient:
         self,
         session: aiohttp.ClientSession | None = None,
         timeout: int = DEFAULT_TIMEOUT,
+        parser: str = DEFAULT_PARSER,
+        cache_ttl: float = 0,
+        cache_ttls: dict[str, float] | None = None,
+        cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        retry_policy: RetryPolicy | None = None,
+        circuit_failure_threshold: int = 3,
+        circuit_recovery_timeout: float = 300,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        streaming: bool = True,
+        max_body_bytes: int = DEFAULT_MAX_BODY_BYTES,
+        limit_per_host: int = DEFAULT_LIMIT_PER_HOST,
+        keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+        accept_compressed: bool = False,
+        api_url: str = API_URL,
+        rate_limit: float | None = DEFAULT_RATE_LIMIT,
+        rate_burst: float = DEFAULT_RATE_BURST,
     ) -> None:
         """Initialize the API client.
 
         Args:
             session: Optional aiohttp session to use
             timeout: Request timeout in seconds
+            parser: Name of the primary parser engine (see PARSER_ENGINES)
+            cache_ttl: Seconds a fetched result is served from memory;
+                0 disables the cache
+            cache_ttls: Per-area TTL overrides keyed by area key
+            cache_max_entries: Maximum number of cached results
+            retry_policy: Retry policy per request (defaults to RetryPolicy())
+            circuit_failure_threshold: Consecutive failed requests after
+                which an area's circuit breaker opens
+            circuit_recovery_timeout: Seconds an open circuit rejects
+                requests before letting a probe through
+            max_concurrency: Maximum number of simultaneous upstream requests
+            streaming: Read the body in chunks and stop as soon as both
+                occupancy values have been received
+            max_body_bytes: Hard cap on the bytes read from a streamed body
+            limit_per_host: Connection limit per host for an owned session
+            keepalive_timeout: Seconds idle connections of an owned session
+                are kept open for reuse
+            accept_compressed: Ask for gzip/deflate encoded responses; the
+                responses are tiny, so identity encoding is the default
+            api_url: admin-ajax.php URL to query, e.g. a local stand-in server
+            rate_limit: Requests per second allowed to the API host, shared
+                with every other client in the process; None disables it
+            rate_burst: Requests allowed at once before rate_limit applies
+
+        Raises:
+            ValueError: If the parser engine is unknown
         """
+        if parser not in PARSER_ENGINES:
+            raise ValueError(f"Unknown parser engine: {parser}")
+
         self._session = session
         self._timeout = aiohttp.ClientTimeout(total=timeout)
         self._own_session = session is None
+        # The primary engine runs first; the selector cascade is only used
+        # when it finds nothing.
+        self._parser_engines: list[ParserEngine] = [PARSER_ENGINES[parser]]
+        if parser != FALLBACK_PARSER:
+            self._parser_engines.append(PARSER_ENGINES[FALLBACK_PARSER])
+        # Per-URL state used to skip re-parsing unchanged responses
+        self._validators: dict[str, dict[str, str]] = {}
+        self._fingerprints: dict[str, bytes] = {}
+        self._last_data: dict[str, OccupancyData] = {}
+        self.stats: defaultdict[str, AreaStats] = defaultdict(AreaStats)
+        self.cache: ResponseCache[OccupancyData] = ResponseCache(cache_max_entries)
+        self.cache_ttl = cache_ttl
+        self.cache_ttls: dict[str, float] = dict(cache_ttls or {})
+        self.retry_policy = retry_policy or RetryPolicy()
+        self._circuit_failure_threshold = circuit_failure_threshold
+        self._circuit_recovery_timeout = circuit_recovery_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._request_slots = asyncio.Semaphore(max_concurrency)
+        self._streaming = streaming
+        self._max_body_bytes = max_body_bytes
+        self._limit_per_host = limit_per_host
+        self._keepalive_timeout = keepalive_timeout
+        self._headers = {
+            **DEFAULT_HEADERS,
+            "Accept-Encoding": "gzip, deflate" if accept_compressed else "identity",
+        }
+        self.connection_stats: dict[str, int] = {"created": 0, "reused": 0}
+        self._api_url = api_url
+        self._bucket = (
+            host_bucket(urlsplit(api_url).netloc, rate_limit, rate_burst)
+            if rate_limit is not None
+            else None
+        )
+        self.metrics = RequestMetrics()
+        # Pending requests keyed by URL, shared by concurrent callers
+        self._inflight: dict[str, asyncio.Future[OccupancyData]] = {}
 
     async def __aenter__(self) -> PhoenixBadApiClient:
         """Async context manager entry."""
         if self._own_session:
-            self._session = aiohttp.ClientSession()
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self._limit_per_host,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, trace_configs=[self.trace_config()]
+            )
         return self
 
     async def __aexit__(self, *args: Any) -> None:
@@ -101,12 +338,206 @@ class PhoenixBadApiClient:
         if self._own_session and self._session:
             await self._session.close()
 
-    async def _fetch_occupancy(self, url: str, area_name: str) -> OccupancyData:
+    @staticmethod
+    def trace_config() -> aiohttp.TraceConfig:
+        """Return a trace config reporting DNS, connect and reuse timings.
+
+        Owned sessions use it automatically; pass it to a session created
+        elsewhere (e.g. via trace_configs) to collect the same metrics.
+        """
+        return create_trace_config()
+
+    def _record_request(
+        self, area_key: str, trace: RequestTrace, elapsed: float
+    ) -> None:
+        """Record connection usage and phase timings up to the response headers.
+
+        Args:
+            area_key: Key of the area
+            trace: Connection timings collected by the trace config
+            elapsed: Seconds from sending the request to the response headers
+        """
+        if trace.created:
+            self.connection_stats["created"] += 1
+        if trace.reused:
+            self.connection_stats["reused"] += 1
+
+        setup = 0.0
+        if trace.dns is not None:
+            self.metrics.observe(area_key, "dns", trace.dns)
+            setup += trace.dns
+        if trace.connect is not None:
+            self.metrics.observe(area_key, "connect", trace.connect)
+            setup += trace.connect
+        self.metrics.observe(area_key, "ttfb", max(0.0, elapsed - setup))
+
+    @property
+    def timeout(self) -> float | None:
+        """Return the total request timeout in seconds."""
+        return self._timeout.total
+
+    @timeout.setter
+    def timeout(self, timeout: float) -> None:
+        """Set the total request timeout in seconds for subsequent requests."""
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+
+    @property
+    def cache_stats(self) -> dict[str, int]:
+        """Return cache hit, miss and eviction counters."""
+        return self.cache.as_dict()
+
+    def invalidate_cache(self, url: str | None = None) -> None:
+        """Drop cached results for a URL, or for all URLs.
+
+        Args:
+            url: API endpoint URL, or None to clear the whole cache
+        """
+        self.cache.invalidate(url)
+
+    def _cache_ttl_for(self, area_key: str) -> float:
+        """Return the cache TTL in seconds for an area."""
+        return self.cache_ttls.get(area_key, self.cache_ttl)
+
+    async def _fetch_occupancy(self, url: str, area_key: str) -> OccupancyData:
+        """Fetch occupancy data through the cache and request coalescing.
+
+        Results younger than the area's cache TTL are served from memory.
+        Callers arriving while a request for the same URL is pending await
+        that request and receive its result or exception.
+
+        Args:
+            url: API endpoint URL
+            area_key: Key of the area (for stats and logging)
+
+        Returns:
+            OccupancyData object with parsed data
+
+        Raises:
+            PhoenixBadConnectionError: If connection fails
+            PhoenixBadParseError: If parsing fails
+        """
+        if (
+            self._cache_ttl_for(area_key) > 0
+            and (cached := self.cache.get(url)) is not None
+        ):
+            _LOGGER.debug("Serving %s data from cache", area_key)
+            return cached
+
+        if (pending := self._inflight.get(url)) is not None:
+            self.stats[area_key].coalesced += 1
+            _LOGGER.debug("Joining pending %s request", area_key)
+        else:
+            pending = asyncio.ensure_future(self._load_occupancy(url, area_key))
+            self._inflight[url] = pending
+
+            def _forget(done: asyncio.Future[OccupancyData]) -> None:
+                if self._inflight.get(url) is done:
+                    del self._inflight[url]
+
+            pending.add_done_callback(_forget)
+
+        # Shield the shared request so one cancelled caller does not cancel
+        # it for everybody else.
+        return await asyncio.shield(pending)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker for a URL, creating it if needed."""
+        if (breaker := self._breakers.get(url)) is None:
+            breaker = self._breakers[url] = CircuitBreaker(
+                self._circuit_failure_threshold, self._circuit_recovery_timeout
+            )
+        return breaker
+
+    async def _load_occupancy(self, url: str, area_key: str) -> OccupancyData:
+        """Request occupancy data and store the result in the cache.
+
+        Args:
+            url: API endpoint URL
+            area_key: Key of the area (for stats and logging)
+
+        Returns:
+            OccupancyData object with parsed data
+
+        Raises:
+            PhoenixBadCircuitOpenError: If the area's circuit breaker is open
+        """
+        breaker = self.breaker(url)
+        if not breaker.allow_request():
+            self.stats[area_key].circuit_rejections += 1
+            raise PhoenixBadCircuitOpenError(
+                f"{area_key} requests suspended after "
+                f"{breaker.failures} consecutive failures"
+            )
+
+        try:
+            data = await self._request_with_retry(url, area_key)
+        except PhoenixBadConnectionError:
+            breaker.record_failure()
+            raise
+        except PhoenixBadParseError:
+            # The endpoint answered, so it is reachable
+            breaker.record_success()
+            raise
+        finally:
+            breaker.release_probe()
+
+        breaker.record_success()
+        self.cache.set(url, data, self._cache_ttl_for(area_key))
+        return data
+
+    async def _request_with_retry(self, url: str, area_key: str) -> OccupancyData:
+        """Request occupancy data, retrying failures per the retry policy.
+
+        Each attempt waits for its rate limit token and then holds one of the
+        max_concurrency request slots; backoff sleeps hold neither, so a
+        retrying area does not take slots away from the others.
+
+        Args:
+            url: API endpoint URL
+            area_key: Key of the area (for stats and logging)
+
+        Returns:
+            OccupancyData object with parsed data
+
+        Raises:
+            PhoenixBadConnectionError: If all connection attempts fail
+            PhoenixBadParseError: If all parse attempts fail
+        """
+        policy = self.retry_policy
+        attempt = 0
+        while True:
+            attempt += 1
+            if self._bucket is not None and (waited := await self._bucket.acquire()):
+                self.stats[area_key].throttled += 1
+                self.stats[area_key].throttle_seconds += waited
+            try:
+                async with self._request_slots:
+                    return await self._request_occupancy(url, area_key)
+            except (PhoenixBadConnectionError, PhoenixBadParseError) as err:
+                if isinstance(err, PhoenixBadConnectionError):
+                    max_attempts = policy.connection_attempts
+                else:
+                    max_attempts = policy.parse_attempts
+                if attempt >= max_attempts:
+                    raise
+
+                delay = policy.delay(attempt)
+                self.stats[area_key].retries += 1
+                _LOGGER.debug(
+                    "Retrying %s request in %.1fs (attempt %d failed: %s)",
+                    area_key,
+                    delay,
+                    attempt,
+                    err,
+                )
+                await asyncio.sleep(delay)
+
+    async def _request_occupancy(self, url: str, area_key: str) -> OccupancyData:
         """Fetch occupancy data from API.
 
         Args:
             url: API endpoint URL
-            area_name: Name of the area (for logging)
+            area_key: Key of the area (for stats and logging)
 
         Returns:
             OccupancyData object with parsed data
@@ -118,39 +549,165 @@ class PhoenixBadApiClient:
         if not self._session:
             raise PhoenixBadApiError("Session not initialized")
 
-        _LOGGER.debug("Fetching %s occupancy data from %s", area_name, url)
+        _LOGGER.debug("Fetching %s occupancy data from %s", area_key, url)
+
+        stats = self.stats[area_key]
+        headers = {**self._headers, **self._validators.get(url, {})}
+
+        trace = RequestTrace()
+        started = time.perf_counter()
 
         try:
             async with self._session.get(
-                url, headers=DEFAULT_HEADERS, timeout=self._timeout
+                url, headers=headers, timeout=self._timeout, trace_request_ctx=trace
             ) as response:
+                stats.requests += 1
+                self._record_request(area_key, trace, time.perf_counter() - started)
+
+                if response.status == 304 and url in self._last_data:
+                    stats.not_modified += 1
+                    _LOGGER.debug("%s data not modified since last poll", area_key)
+                    return self._last_data[url]
+
                 if response.status != 200:
                     error_msg = (
                         f"API returned status {response.status}: {response.reason}"
                     )
-                    _LOGGER.error("Failed to fetch %s data: %s", area_name, error_msg)
+                    _LOGGER.error("Failed to fetch %s data: %s", area_key, error_msg)
                     raise PhoenixBadConnectionError(error_msg)
 
-                text = await response.text()
-                _LOGGER.debug("Raw %s response: %s", area_name, text.strip())
+                read_started = time.perf_counter()
+                body = await self._read_body(response, area_key)
+                self.metrics.observe(
+                    area_key, "body", time.perf_counter() - read_started
+                )
 
-                return self._parse_response(text, area_name)
+                # Servers without validators still tend to return identical
+                # bytes, so compare a digest before decoding and parsing.
+                fingerprint = hashlib.blake2b(body, digest_size=16).digest()
+                previous = self._last_data.get(url)
+                if previous is not None and self._fingerprints.get(url) == fingerprint:
+                    stats.fingerprint_hits += 1
+                    _LOGGER.debug("%s response unchanged, skipping parse", area_key)
+                    return previous
+
+                text = body.decode(response.charset or "utf-8", errors="replace")
+                _LOGGER.debug("Raw %s response: %s", area_key, text.strip())
+
+                parse_started = time.perf_counter()
+                data = self._parse_response(text, area_key)
+                self.metrics.observe(
+                    area_key, "parse", time.perf_counter() - parse_started
+                )
+                self._remember(url, response.headers, fingerprint, data)
+                return data
 
         except aiohttp.ClientError as err:
             error_msg = f"Connection error: {err}"
-            _LOGGER.error("Failed to fetch %s data: %s", area_name, error_msg)
+            _LOGGER.error("Failed to fetch %s data: %s", area_key, error_msg)
             raise PhoenixBadConnectionError(error_msg) from err
         except asyncio.TimeoutError as err:
             error_msg = "Request timeout"
-            _LOGGER.error("Failed to fetch %s data: %s", area_name, error_msg)
+            _LOGGER.error("Failed to fetch %s data: %s", area_key, error_msg)
             raise PhoenixBadConnectionError(error_msg) from err
 
-    def _parse_response(self, html: str, area_name: str) -> OccupancyData:
+    async def _read_body(
+        self, response: aiohttp.ClientResponse, area_key: str
+    ) -> bytes:
+        """Read a response body, streaming it with a byte cap if enabled.
+
+        In streaming mode reading stops once a data-free attribute and a
+        width percentage have been received, or when max_body_bytes is
+        reached. Whatever was read is then handed to the parser.
+
+        Args:
+            response: Response to read
+            area_key: Key of the area (for stats and logging)
+
+        Returns:
+            The (possibly partial) raw body
+        """
+        stats = self.stats[area_key]
+
+        if not self._streaming:
+            body = await response.read()
+        else:
+            buffer = bytearray()
+            async for chunk in response.content.iter_chunked(READ_CHUNK_SIZE):
+                buffer += chunk
+                if len(buffer) >= self._max_body_bytes:
+                    del buffer[self._max_body_bytes :]
+                    stats.truncated += 1
+                    _LOGGER.warning(
+                        "%s response exceeds %d bytes, parsing truncated body",
+                        area_key,
+                        self._max_body_bytes,
+                    )
+                    break
+                if has_occupancy_values(buffer):
+                    break
+            body = bytes(buffer)
+
+        stats.bytes_read += len(body)
+        stats.last_bytes_read = len(body)
+        return body
+
+    def _remember(
+        self,
+        url: str,
+        headers: Any,
+        fingerprint: bytes,
+        data: OccupancyData,
+    ) -> None:
+        """Store validators, body fingerprint and parsed data for a URL.
+
+        Args:
+            url: API endpoint URL
+            headers: Response headers
+            fingerprint: Digest of the raw response body
+            data: Parsed occupancy data
+        """
+        validators: dict[str, str] = {}
+        if etag := headers.get("ETag"):
+            validators["If-None-Match"] = etag
+        if last_modified := headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = last_modified
+
+        self._validators[url] = validators
+        self._fingerprints[url] = fingerprint
+        self._last_data[url] = data
+
+    def _extract(self, html: str) -> RawOccupancy | None:
+        """Run the parser engine cascade until one finds occupancy data.
+
+        Args:
+            html: HTML response text
+
+        Returns:
+            RawOccupancy from the first engine that found an occupancy
+            element, or None if none did
+        """
+        primary, *fallbacks = self._parser_engines
+        raw = primary(html)
+        if raw is not None:
+            return raw
+
+        # Closed areas never contain markup, so skip building a tree for them
+        if "Area data missing" in html and "outer_wrapper" not in html:
+            return None
+
+        for engine in fallbacks:
+            raw = engine(html)
+            if raw is not None:
+                return raw
+        return None
+
+    def _parse_response(self, html: str, area_key: str) -> OccupancyData:
         """Parse HTML response to extract occupancy data.
 
         Args:
             html: HTML response text
-            area_name: Name of the area (for logging)
+            area_key: Key of the area (for stats and logging)
 
         Returns:
             OccupancyData object with parsed data
@@ -159,64 +716,43 @@ class PhoenixBadApiClient:
             PhoenixBadParseError: If parsing fails
         """
         try:
-            soup = BeautifulSoup(html, "html.parser")
+            raw = self._extract(html)
 
-            # Find the outer wrapper div with data-free attribute
-            # We first try the specific class, then fall back to any element with data-free
-            outer_div = soup.find("div", class_="outer_wrapper") or soup.find(
-                attrs={"data-free": True}
-            )
-
-            if not outer_div:
+            if raw is None:
                 if "Area data missing" in html:
-                    _LOGGER.debug("%s area data missing (likely closed)", area_name)
+                    _LOGGER.debug("%s area data missing (likely closed)", area_key)
                     return OccupancyData(free=0, occupied=0, percentage=0.0)
 
                 # Log a snippet of the HTML to help debug future changes
                 _LOGGER.error(
                     "Could not find occupancy data in %s response. HTML snippet: %s",
-                    area_name,
+                    area_key,
                     html[:200],
                 )
                 raise PhoenixBadParseError(
-                    f"Could not find occupancy data element in {area_name} response"
+                    f"Could not find occupancy data element in {area_key} response"
                 )
 
             # Get free spaces from data-free attribute
-            data_free = outer_div.get("data-free")
-            if data_free is None:
+            if raw.data_free is None:
                 raise PhoenixBadParseError(
-                    f"Could not find data-free attribute in {area_name} response"
+                    f"Could not find data-free attribute in {area_key} response"
                 )
 
-            if isinstance(data_free, list):
-                data_free = data_free[0] if data_free else "0"
-
             try:
-                free = int(str(data_free))
+                free = int(raw.data_free)
             except ValueError:
-                _LOGGER.warning("Could not parse data-free attribute: %s", data_free)
+                _LOGGER.warning(
+                    "Could not parse data-free attribute: %s", raw.data_free
+                )
                 free = 0
 
-            # Get occupied percentage from style attribute
-            # We look for the inner_wrapper, but fall back to searching children for width
-            inner_div = outer_div.find("div", class_="inner_wrapper") or outer_div.find(
-                attrs={"style": re.compile(r"width")}
-            )
-
-            if not inner_div:
-                # No visitors or different structure, try to find width in whole HTML
-                width_match = re.search(r"width:\s*([\d.]+)%", html)
-            else:
-                style = str(inner_div.get("style", ""))
-                width_match = re.search(r"width:\s*([\d.]+)%", style)
-
-            if not width_match:
+            if raw.width is None:
                 # No width found, assume 0% occupancy
-                _LOGGER.debug("%s has no width percentage, assuming 0%%", area_name)
+                _LOGGER.debug("%s has no width percentage, assuming 0%%", area_key)
                 return OccupancyData(free=free, occupied=0, percentage=0.0)
 
-            occupied_pct = float(width_match.group(1))
+            occupied_pct = float(raw.width)
 
             # Calculate occupied count from percentage and free spaces
             # Formula: occupied = (occupied_pct * free) / (100 - occupied_pct)
@@ -224,14 +760,14 @@ class PhoenixBadApiClient:
                 # Edge case: 100% occupancy
                 occupied = free  # Assume total capacity = 2 * free
                 _LOGGER.warning(
-                    "%s shows 100%% occupancy, calculation may be inaccurate", area_name
+                    "%s shows 100%% occupancy, calculation may be inaccurate", area_key
                 )
             else:
                 occupied = round((occupied_pct * free) / (100 - occupied_pct))
 
             _LOGGER.debug(
                 "%s data parsed: free=%d, occupied=%d, percentage=%.2f%%",
-                area_name,
+                area_key,
                 free,
                 occupied,
                 occupied_pct,
@@ -240,37 +776,52 @@ class PhoenixBadApiClient:
             return OccupancyData(free=free, occupied=occupied, percentage=occupied_pct)
 
         except (ValueError, AttributeError) as err:
-            error_msg = f"Failed to parse {area_name} response: {err}"
+            error_msg = f"Failed to parse {area_key} response: {err}"
             _LOGGER.error(error_msg)
             raise PhoenixBadParseError(error_msg) from err
 
+    async def get_area_occupancy(self, area: Area) -> OccupancyData:
+        """Get occupancy data for a single area."""
+        return await self._fetch_occupancy(area.url_for(self._api_url), area.key)
+
     async def get_pool_occupancy(self) -> OccupancyData:
         """Get pool occupancy data."""
-        return await self._fetch_occupancy(POOL_URL, "Pool")
+        return await self.get_area_occupancy(AREAS_BY_KEY["pool"])
 
     async def get_sauna_occupancy(self) -> OccupancyData:
         """Get sauna occupancy data."""
-        return await self._fetch_occupancy(SAUNA_URL, "Sauna")
+        return await self.get_area_occupancy(AREAS_BY_KEY["sauna"])
+
+    async def get_all_occupancy(
+        self, areas: Iterable[Area] = AREAS
+    ) -> dict[str, OccupancyData]:
+        """Get occupancy data for all areas.
 
-    async def get_all_occupancy(self) -> dict[str, OccupancyData]:
-        """Get occupancy data for all areas."""
-        pool_data, sauna_data = await asyncio.gather(
-            self.get_pool_occupancy(),
-            self.get_sauna_occupancy(),
+        Areas are fetched concurrently, bounded by max_concurrency. Areas
+        that fail are logged and left out of the result.
+
+        Args:
+            areas: Areas to fetch (defaults to the area registry)
+
+        Returns:
+            Dictionary mapping area keys to OccupancyData
+
+        Raises:
+            PhoenixBadConnectionError: If no area could be fetched
+        """
+        areas = tuple(areas)
+        results = await asyncio.gather(
+            *(self.get_area_occupancy(area) for area in areas),
             return_exceptions=True,
         )
 
         result: dict[str, OccupancyData] = {}
 
-        if isinstance(pool_data, BaseException):
-            _LOGGER.error("Failed to fetch pool data: %s", pool_data)
-        else:
-            result["pool"] = pool_data
-
-        if isinstance(sauna_data, BaseException):
-            _LOGGER.error("Failed to fetch sauna data: %s", sauna_data)
-        else:
-            result["sauna"] = sauna_data
+        for area, data in zip(areas, results):
+            if isinstance(data, BaseException):
+                _LOGGER.error("Failed to fetch %s data: %s", area.key, data)
+            else:
+                result[area.key] = data
 
         if not result:
             raise PhoenixBadConnectionError("Failed to fetch data for all areas")
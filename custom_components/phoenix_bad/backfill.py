@@ -0,0 +1,200 @@
+"""Backfill of Phoenix-Bad history from the recorder."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from functools import partial
+import logging
+import time
+from typing import Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .api import Area
+from .const import DOMAIN
+from .coordinator import PhoenixBadRuntimeData
+from .history import HistoryRecord
+
+_LOGGER = logging.getLogger(__name__)
+
+# Statistics are read in windows of this size, one query each
+BACKFILL_BATCH = timedelta(days=90)
+DEFAULT_BACKFILL_DAYS = 3 * 365
+MAX_BACKFILL_DAYS = 10 * 365
+# Hourly statistics are attributed to the middle of their hour
+HOUR_MIDPOINT = 1800
+
+
+@dataclass
+class BackfillResult:
+    """Outcome of backfilling one area."""
+
+    rows: int = 0
+    batches: int = 0
+    inserted: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the result with its throughput."""
+        return {
+            "rows": self.rows,
+            "batches": self.batches,
+            "inserted": self.inserted,
+            "seconds": round(self.seconds, 3),
+            "rows_per_second": round(self.rows / self.seconds) if self.seconds else 0,
+        }
+
+
+def _start_timestamp(row: dict[str, Any]) -> float:
+    """Return the start of a statistics row as a Unix timestamp."""
+    start = row["start"]
+    # Older recorder versions return datetimes instead of timestamps
+    return start.timestamp() if isinstance(start, datetime) else float(start)
+
+
+async def _async_read_records(
+    hass: HomeAssistant, entity_id: str, start: datetime, end: datetime
+) -> list[HistoryRecord]:
+    """Read the open occupancy of one window from the recorder.
+
+    Hourly statistics are used where they exist. The part of the window
+    before the first statistic, from before the sensor had a state class,
+    is read from the recorded state changes instead.
+
+    Args:
+        hass: Home Assistant instance
+        entity_id: Occupancy sensor, which is also its statistic id
+        start: Start of the window
+        end: End of the window (exclusive)
+
+    Returns:
+        Records in chronological order with zero free and occupied counts
+    """
+    # The recorder is optional and only needed once a backfill runs
+    from homeassistant.components.recorder import get_instance, history
+    from homeassistant.components.recorder.statistics import (
+        statistics_during_period,
+    )
+
+    recorder = get_instance(hass)
+    stats = await recorder.async_add_executor_job(
+        statistics_during_period,
+        hass,
+        start,
+        end,
+        {entity_id},
+        "hour",
+        None,
+        {"mean"},
+    )
+    rows = stats.get(entity_id, [])
+    records = [
+        HistoryRecord(_start_timestamp(row) + HOUR_MIDPOINT, 0, 0, row["mean"])
+        for row in rows
+        if row.get("mean")
+    ]
+    records = [record for record in records if record.timestamp < end.timestamp()]
+    first = _start_timestamp(rows[0]) if rows else end.timestamp()
+    if first <= start.timestamp():
+        return records
+
+    states = await recorder.async_add_executor_job(
+        partial(
+            history.state_changes_during_period,
+            hass,
+            start,
+            dt_util.utc_from_timestamp(first),
+            entity_id,
+            include_start_time_state=False,
+        )
+    )
+    earlier = []
+    for state in states.get(entity_id, []):
+        if state.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+            continue
+        try:
+            percentage = float(state.state)
+        except ValueError:
+            continue
+        if percentage:
+            earlier.append(
+                HistoryRecord(state.last_changed.timestamp(), 0, 0, percentage)
+            )
+    return earlier + records
+
+
+async def async_backfill_area(
+    hass: HomeAssistant,
+    runtime_data: PhoenixBadRuntimeData,
+    area: Area,
+    days: int = DEFAULT_BACKFILL_DAYS,
+) -> BackfillResult:
+    """Copy the recorded occupancy of an area into history and forecast.
+
+    The recorder is read on its executor in BACKFILL_BATCH windows, newest
+    first, ending at the oldest record already stored. The history ring
+    only takes records older than what it holds, and the forecast only
+    folds records older than the time it already covers, so running it
+    again does not count any hour twice. The recorder only has the
+    percentage, so the backfilled records have zero free and occupied
+    counts; a percentage of 0 is treated as closed and skipped.
+
+    Args:
+        hass: Home Assistant instance
+        runtime_data: Runtime data of the config entry
+        area: Area to backfill
+        days: How far back to read the recorder
+
+    Returns:
+        Row, batch and throughput counters
+    """
+    result = BackfillResult()
+    history = runtime_data.history
+    forecast_store = runtime_data.forecast_store
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"phoenixbad_{area.key}_occupancy"
+    )
+    if entity_id is None or history is None:
+        return result
+
+    started = time.perf_counter()
+    oldest = await history.async_oldest_timestamp(area.key)
+    end = dt_util.utc_from_timestamp(oldest) if oldest is not None else dt_util.utcnow()
+    start = end - timedelta(days=days)
+    capacity = history.histories[area.key].capacity
+    # Only the newest records fit into the ring; older ones still feed the
+    # forecast
+    batches: list[list[HistoryRecord]] = []
+    kept = 0
+
+    batch_end = end
+    while batch_end > start:
+        batch_start = max(batch_end - BACKFILL_BATCH, start)
+        batch = await _async_read_records(hass, entity_id, batch_start, batch_end)
+        if forecast_store is not None:
+            forecast_store.record_percentages(area.key, batch, batch_start.timestamp())
+        if kept < capacity:
+            batches.append(batch)
+            kept += len(batch)
+
+        result.rows += len(batch)
+        result.batches += 1
+        elapsed = time.perf_counter() - started
+        _LOGGER.info(
+            "Backfilling %s: %d%% (%d rows, %.0f rows/s)",
+            area.key,
+            100 * (end - batch_start) / (end - start),
+            result.rows,
+            result.rows / elapsed if elapsed else 0,
+        )
+        batch_end = batch_start
+
+    records = [record for batch in reversed(batches) for record in batch]
+    result.inserted = await history.async_backfill(area.key, records[-capacity:])
+    result.seconds = time.perf_counter() - started
+    _LOGGER.info("Backfilled %s: %s", area.key, result.as_dict())
+    return result
@@ -0,0 +1,100 @@
+"""In-memory response cache for the Phoenix-Bad API client."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import time
+from typing import Generic, TypeVar
+
+_T = TypeVar("_T")
+
+DEFAULT_CACHE_MAX_ENTRIES = 16
+
+
+class ResponseCache(Generic[_T]):
+    """Bounded cache with a per-entry TTL and least-recently-used eviction."""
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_MAX_ENTRIES) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of entries kept before evicting the
+                least recently used one
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, _T]] = OrderedDict()
+
+    def __len__(self) -> int:
+        """Return the number of cached entries, including expired ones."""
+        return len(self._entries)
+
+    def get(self, key: str) -> _T | None:
+        """Return a cached value if present and not expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value: _T, ttl: float) -> None:
+        """Store a value for ttl seconds.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Time to live in seconds; values <= 0 are not stored
+        """
+        if ttl <= 0:
+            return
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one entry, or all entries if no key is given.
+
+        Args:
+            key: Cache key to drop, or None to clear the cache
+        """
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def as_dict(self) -> dict[str, int]:
+        """Return the cache counters."""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
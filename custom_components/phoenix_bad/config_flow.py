@@ -2,19 +2,122 @@
 
 from __future__ import annotations
 
+from datetime import timedelta
+from typing import Any
+
 import homeassistant.helpers.config_validation as cv
 from homeassistant import config_entries
+from homeassistant.core import callback
+import voluptuous as vol
 
-from .const import DOMAIN
+from .api import DEFAULT_TIMEOUT
+from .const import (
+    CONF_BLOCKING_FIRST_REFRESH,
+    CONF_CACHE_TTL,
+    CONF_OCCUPANCY_DEADBAND,
+    CONF_OPENING_HOURS,
+    CONF_RETRY_ATTEMPTS,
+    CONF_SCAN_INTERVAL,
+    CONF_STALE_GRACE,
+    CONF_TIMEOUT,
+    DEFAULT_BLOCKING_FIRST_REFRESH,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_OCCUPANCY_DEADBAND,
+    DEFAULT_OPENING_HOURS,
+    DEFAULT_STALE_GRACE,
+    DOMAIN,
+    MAX_CACHE_TTL,
+    MAX_OCCUPANCY_DEADBAND,
+    MAX_RETRY_ATTEMPTS,
+    MAX_SCAN_INTERVAL,
+    MAX_STALE_GRACE,
+    MAX_TIMEOUT,
+    MIN_RETRY_ATTEMPTS,
+    MIN_SCAN_INTERVAL,
+    MIN_TIMEOUT,
+)
+from .resilience import DEFAULT_CONNECTION_ATTEMPTS
+from .scheduler import OpeningHours
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
 
+def _minutes(interval: timedelta) -> int:
+    """Return a timedelta in whole minutes."""
+    return int(interval.total_seconds() // 60)
+
+
+def _options_schema(options: dict[str, Any]) -> vol.Schema:
+    """Return the options schema with the current values as defaults."""
+    return vol.Schema(
+        {
+            # Suggested values instead of defaults, so clearing a field
+            # leaves the choice to the scheduler or removes the opening hours
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                description={"suggested_value": options.get(CONF_SCAN_INTERVAL)},
+            ): vol.All(
+                vol.Coerce(int),
+                vol.Range(
+                    min=_minutes(MIN_SCAN_INTERVAL), max=_minutes(MAX_SCAN_INTERVAL)
+                ),
+            ),
+            vol.Optional(
+                CONF_OPENING_HOURS,
+                description={
+                    "suggested_value": options.get(
+                        CONF_OPENING_HOURS, DEFAULT_OPENING_HOURS
+                    )
+                },
+            ): str,
+            vol.Optional(
+                CONF_TIMEOUT, default=options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+            ): vol.All(vol.Coerce(int), vol.Range(min=MIN_TIMEOUT, max=MAX_TIMEOUT)),
+            vol.Optional(
+                CONF_RETRY_ATTEMPTS,
+                default=options.get(CONF_RETRY_ATTEMPTS, DEFAULT_CONNECTION_ATTEMPTS),
+            ): vol.All(
+                vol.Coerce(int),
+                vol.Range(min=MIN_RETRY_ATTEMPTS, max=MAX_RETRY_ATTEMPTS),
+            ),
+            vol.Optional(
+                CONF_CACHE_TTL, default=options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_CACHE_TTL)),
+            vol.Optional(
+                CONF_STALE_GRACE,
+                default=options.get(CONF_STALE_GRACE, _minutes(DEFAULT_STALE_GRACE)),
+            ): vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=_minutes(MAX_STALE_GRACE))
+            ),
+            vol.Optional(
+                CONF_OCCUPANCY_DEADBAND,
+                default=options.get(
+                    CONF_OCCUPANCY_DEADBAND, DEFAULT_OCCUPANCY_DEADBAND
+                ),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=MAX_OCCUPANCY_DEADBAND)),
+            vol.Optional(
+                CONF_BLOCKING_FIRST_REFRESH,
+                default=options.get(
+                    CONF_BLOCKING_FIRST_REFRESH, DEFAULT_BLOCKING_FIRST_REFRESH
+                ),
+            ): bool,
+        }
+    )
+
+
 class PhoenixBadConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: ignore
     """Handle a config flow for Phönix Bad."""
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> PhoenixBadOptionsFlow:
+        """Return the options flow handler."""
+        return PhoenixBadOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         if self._async_current_entries():
@@ -28,3 +131,32 @@ class PhoenixBadConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):  # type: i
     async def async_step_import(self, user_input=None):
         """Handle the import step."""
         return await self.async_step_user(user_input)
+
+
+class PhoenixBadOptionsFlow(config_entries.OptionsFlow):
+    """Handle Phönix Bad options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage polling, opening hours, request, stale data and startup options."""
+        options = dict(self.config_entry.options)
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            user_input[CONF_OPENING_HOURS] = user_input.get(
+                CONF_OPENING_HOURS, ""
+            ).strip()
+            try:
+                OpeningHours.from_text(user_input[CONF_OPENING_HOURS])
+            except ValueError:
+                errors = {CONF_OPENING_HOURS: "invalid_opening_hours"}
+            else:
+                # A cleared interval leaves it to the scheduler again
+                if CONF_SCAN_INTERVAL not in user_input:
+                    options.pop(CONF_SCAN_INTERVAL, None)
+                # Keep options that are not part of this form
+                return self.async_create_entry(data={**options, **user_input})
+            options.update(user_input)
+
+        return self.async_show_form(
+            step_id="init", data_schema=_options_schema(options), errors=errors
+        )
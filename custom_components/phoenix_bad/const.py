@@ -16,17 +16,23 @@ DEFAULT_SCAN_INTERVAL: Final = timedelta(hours=1)
 MIN_SCAN_INTERVAL: Final = timedelta(minutes=5)
 MAX_SCAN_INTERVAL: Final = timedelta(hours=24)
 
-# Sensor types
-SENSOR_TYPE_POOL: Final = "pool"
-SENSOR_TYPE_SAUNA: Final = "sauna"
-
-# Sensor keys
-SENSOR_KEY_POOL_OCCUPANCY: Final = "pool_occupancy"
-SENSOR_KEY_SAUNA_OCCUPANCY: Final = "sauna_occupancy"
-SENSOR_KEY_POOL_FREE: Final = "pool_free"
-SENSOR_KEY_SAUNA_FREE: Final = "sauna_free"
-SENSOR_KEY_POOL_OCCUPIED: Final = "pool_occupied"
-SENSOR_KEY_SAUNA_OCCUPIED: Final = "sauna_occupied"
+# Adaptive polling. Without opening hours the scheduler polls at
+# DEFAULT_SCAN_INTERVAL while open, so it never polls more than a fixed
+# schedule would. With opening hours it sleeps while closed and spends the
+# saved polls on the shorter open interval and on polling faster while
+# occupancy changes by more than TARGET_CHANGE_PER_POLL percentage points
+# between polls. While every area keeps reporting closed, the closed
+# interval doubles with every poll up to MAX_CLOSED_SCAN_INTERVAL.
+OPEN_SCAN_INTERVAL: Final = timedelta(minutes=15)
+CLOSED_SCAN_INTERVAL: Final = timedelta(hours=1)
+MAX_CLOSED_SCAN_INTERVAL: Final = timedelta(hours=4)
+TARGET_CHANGE_PER_POLL: Final = 2.0
+
+# Weekly opening hours in local time, e.g. "mon-fri 07:00-22:00; sat,sun
+# 08:00-20:00". They are not published by the API, so none are assumed:
+# polling then runs around the clock and backs off while every area
+# reports closed.
+DEFAULT_OPENING_HOURS: Final = ""
 
 # Device info
 MANUFACTURER: Final = "Phoenix-Bad Ottobrunn"
@@ -38,6 +44,34 @@ WEBSITE_URL: Final = "https://phoenixbad.de"
 
 # Configuration options
 CONF_SCAN_INTERVAL: Final = "scan_interval"
+CONF_BLOCKING_FIRST_REFRESH: Final = "blocking_first_refresh"
+CONF_TIMEOUT: Final = "timeout"
+CONF_RETRY_ATTEMPTS: Final = "retry_attempts"
+CONF_CACHE_TTL: Final = "cache_ttl"
+CONF_STALE_GRACE: Final = "stale_grace"
+CONF_OPENING_HOURS: Final = "opening_hours"
+CONF_OCCUPANCY_DEADBAND: Final = "occupancy_deadband"
+
+# Option bounds; the scan interval option is in minutes and sets the
+# interval used while open and steady, the others are in seconds
+MIN_TIMEOUT: Final = 5
+MAX_TIMEOUT: Final = 120
+MIN_RETRY_ATTEMPTS: Final = 1
+MAX_RETRY_ATTEMPTS: Final = 10
+MAX_CACHE_TTL: Final = 3600
+DEFAULT_CACHE_TTL: Final = 0
+
+# How long the last good value of an area is served after failed refreshes
+DEFAULT_STALE_GRACE: Final = timedelta(hours=1)
+MAX_STALE_GRACE: Final = timedelta(hours=24)
+
+# Occupancy changes in percentage points that are not published; by
+# default every change is
+DEFAULT_OCCUPANCY_DEADBAND: Final = 0.0
+MAX_OCCUPANCY_DEADBAND: Final = 10.0
+
+# Entities are registered right away and the first fetch runs in the background
+DEFAULT_BLOCKING_FIRST_REFRESH: Final = False
 
 # Attributes
 ATTR_FREE: Final = "free"
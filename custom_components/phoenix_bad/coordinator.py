@@ -2,15 +2,51 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
 import logging
+import math
+import time
+from typing import Any
 
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 import aiohttp
 
-from .api import PhoenixBadApiClient, PhoenixBadApiError, OccupancyData
-from .const import DOMAIN, DEFAULT_SCAN_INTERVAL
+from .api import (
+    AREAS,
+    DEFAULT_TIMEOUT,
+    OCCUPANCY_FIELDS,
+    Area,
+    PhoenixBadApiClient,
+    PhoenixBadApiError,
+    OccupancyData,
+)
+from .const import (
+    CONF_CACHE_TTL,
+    CONF_OCCUPANCY_DEADBAND,
+    CONF_OPENING_HOURS,
+    CONF_RETRY_ATTEMPTS,
+    CONF_SCAN_INTERVAL,
+    CONF_STALE_GRACE,
+    CONF_TIMEOUT,
+    DEFAULT_CACHE_TTL,
+    DEFAULT_OCCUPANCY_DEADBAND,
+    DEFAULT_OPENING_HOURS,
+    DOMAIN,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_STALE_GRACE,
+)
+from .resilience import DEFAULT_CONNECTION_ATTEMPTS
+from .scheduler import AdaptiveScheduler, OpeningHours
+from .storage import (
+    OccupancyForecastStore,
+    OccupancyHistoryWriter,
+    OccupancySnapshot,
+    OccupancySnapshotStore,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,40 +54,259 @@ _LOGGER = logging.getLogger(__name__)
 class PhoenixBadCoordinator(DataUpdateCoordinator[dict[str, OccupancyData]]):
     """Class to manage fetching Phoenix-Bad data."""
 
+    # Set by the scheduler after every update
+    update_interval: timedelta | None
+
     def __init__(
         self,
         hass: HomeAssistant,
         session: aiohttp.ClientSession,
         scan_interval: timedelta | None = None,
+        api: PhoenixBadApiClient | None = None,
+        snapshot_store: OccupancySnapshotStore | None = None,
+        scheduler: AdaptiveScheduler | None = None,
+        areas: Sequence[Area] = AREAS,
+        deadbands: Mapping[str, float] | None = None,
+        stale_grace: timedelta = DEFAULT_STALE_GRACE,
+        history: OccupancyHistoryWriter | None = None,
+        forecast_store: OccupancyForecastStore | None = None,
     ) -> None:
         """Initialize the coordinator.
 
         Args:
             hass: Home Assistant instance
             session: aiohttp session to use
-            scan_interval: Update interval (defaults to DEFAULT_SCAN_INTERVAL)
+            scan_interval: Fixed update interval; when omitted the interval
+                is picked by the scheduler after every update
+            api: API client to use instead of creating one for the session
+            snapshot_store: Store that persists the last good data per area
+            scheduler: Adaptive scheduler to use instead of the default one
+            areas: Areas this coordinator fetches (defaults to all areas)
+            deadbands: Largest change per OccupancyData field that is not
+                published to listeners; by default any change is published
+            stale_grace: How long an area's last good data is served after
+                its refreshes started failing
+            history: Writer that records every fetched sample
+            forecast_store: Forecast every fetched sample is folded into
+
+        Raises:
+            ValueError: If a deadband names an unknown field
         """
+        self.areas = tuple(areas)
+        self.deadbands = dict(deadbands or {})
+        self.stale_grace = stale_grace
+        self.history = history
+        self.forecast_store = forecast_store
+        if unknown := set(self.deadbands) - set(OCCUPANCY_FIELDS):
+            raise ValueError(f"Unknown deadband fields: {', '.join(sorted(unknown))}")
         super().__init__(
             hass,
             _LOGGER,
-            name=DOMAIN,
+            name=f"{DOMAIN} {', '.join(area.key for area in self.areas)}",
             update_interval=scan_interval or DEFAULT_SCAN_INTERVAL,
+            # Listeners are only called when the published data changed
+            always_update=False,
+        )
+        self.api = api or PhoenixBadApiClient(session=session)
+        self.snapshot_store = snapshot_store
+        # A fixed scan interval disables adaptive scheduling
+        self.scheduler = scheduler or (
+            AdaptiveScheduler() if scan_interval is None else None
+        )
+        # Seconds spent in entry setup and in the first refresh
+        self.startup_timings: dict[str, float] = {}
+        # When each area's data was fetched, and areas showing data that
+        # was restored from disk or kept after a failed refresh
+        self.last_fetched: dict[str, datetime] = {}
+        self.stale_areas: set[str] = set()
+        # Successful updates that did not notify listeners
+        self.suppressed_updates = 0
+
+    def restore(self, snapshot: OccupancySnapshot) -> None:
+        """Seed the coordinator with previously persisted data.
+
+        The restored areas are marked stale until a live refresh replaces
+        them.
+
+        Args:
+            snapshot: Last good sample and fetch time per area
+        """
+        snapshot = {
+            area.key: snapshot[area.key] for area in self.areas if area.key in snapshot
+        }
+        if not snapshot:
+            return
+        self.data = {area: data for area, (data, _) in snapshot.items()}
+        self.last_fetched = {area: fetched for area, (_, fetched) in snapshot.items()}
+        self.stale_areas = set(snapshot)
+        _LOGGER.debug("Restored occupancy for %s", ", ".join(sorted(snapshot)))
+
+    async def async_background_first_refresh(self) -> None:
+        """Run the first refresh outside of entry setup and time it."""
+        started = time.perf_counter()
+        await self.async_refresh()
+        self.startup_timings["first_refresh"] = time.perf_counter() - started
+        _LOGGER.debug(
+            "Background first refresh finished in %.3fs",
+            self.startup_timings["first_refresh"],
         )
-        self.api = PhoenixBadApiClient(session=session)
+
+    def _schedule_next(self, data: dict[str, OccupancyData] | None) -> None:
+        """Let the scheduler pick the interval until the next update.
+
+        Args:
+            data: Data of the update that just finished, None if it failed
+        """
+        if self.scheduler is None:
+            return
+        interval = self.scheduler.next_interval(dt_util.now(), data)
+        if interval != self.update_interval:
+            _LOGGER.debug("Next update in %s", interval)
+            self.update_interval = interval
 
     async def _async_update_data(self) -> dict[str, OccupancyData]:
         """Fetch data from API.
 
         Returns:
-            Dictionary with 'pool' and 'sauna' keys containing OccupancyData
+            Dictionary mapping the keys of this coordinator's areas to
+            OccupancyData
 
         Raises:
-            UpdateFailed: If update fails
+            UpdateFailed: If the update failed and no area has data within
+                the stale grace window
         """
+        stale_before = set(self.stale_areas)
+        error: PhoenixBadApiError | None = None
         try:
             _LOGGER.debug("Fetching Phoenix-Bad occupancy data")
-            data = await self.api.get_all_occupancy()
-            _LOGGER.debug("Successfully fetched data for %d areas", len(data))
-            return data
+            fetched = await self.api.get_all_occupancy(self.areas)
+            _LOGGER.debug("Successfully fetched data for %d areas", len(fetched))
         except PhoenixBadApiError as err:
-            raise UpdateFailed(f"Error communicating with API: {err}") from err
+            error = err
+            fetched = {}
+        self._schedule_next(fetched or None)
+
+        now = dt_util.utcnow()
+        for key, value in fetched.items():
+            self.last_fetched[key] = now
+            if self.history is not None:
+                self.history.add(key, value, now)
+            if self.forecast_store is not None:
+                self.forecast_store.record(key, value, now)
+
+        # Serve the last good data of failed areas within the grace window
+        previous = self.data or {}
+        data = dict(fetched)
+        for area in self.areas:
+            fetched_at = self.last_fetched.get(area.key)
+            if (
+                area.key not in data
+                and area.key in previous
+                and fetched_at is not None
+                and now - fetched_at <= self.stale_grace
+            ):
+                data[area.key] = previous[area.key]
+        self.stale_areas = set(data) - set(fetched)
+
+        if not data:
+            raise UpdateFailed(f"Error communicating with API: {error}") from error
+        if newly_stale := self.stale_areas - stale_before:
+            _LOGGER.warning(
+                "Refresh of %s failed, serving last known data for up to %s",
+                ", ".join(sorted(newly_stale)),
+                self.stale_grace,
+            )
+
+        # Keep the previous sample while every field stays within its
+        # deadband, so the result compares equal and no state is written.
+        published = {
+            key: previous[key]
+            if key in previous and value.is_close(previous[key], self.deadbands)
+            else value
+            for key, value in data.items()
+        }
+        if published == previous:
+            if self.stale_areas != stale_before:
+                # Same values, but the stale flags changed
+                self.async_update_listeners()
+            elif fetched and self.last_update_success:
+                # Only fetches that brought nothing new; failed refreshes
+                # serving stale data are not suppressed updates
+                self.suppressed_updates += 1
+                _LOGGER.debug("Occupancy unchanged, not notifying listeners")
+
+        if self.snapshot_store is not None:
+            self.snapshot_store.async_save_if_changed(
+                {
+                    key: (value, self.last_fetched[key])
+                    for key, value in published.items()
+                    if key in fetched
+                },
+                self.stale_grace,
+            )
+        return published
+
+
+@dataclass
+class PhoenixBadRuntimeData:
+    """Objects shared by the platforms of a config entry.
+
+    Every area has its own coordinator, so a slow or failing area neither
+    delays nor fails the others; all of them share one API client, and with
+    it the session, cache and per-area circuit breakers.
+    """
+
+    api: PhoenixBadApiClient
+    coordinators: dict[str, PhoenixBadCoordinator]
+    history: OccupancyHistoryWriter | None = None
+    forecast_store: OccupancyForecastStore | None = None
+    # Seconds spent in entry setup
+    startup_timings: dict[str, float] = field(default_factory=dict)
+
+    def apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply config entry options to the running client and coordinators.
+
+        Args:
+            options: Config entry options; missing keys use the defaults
+        """
+        api = self.api
+        api.timeout = options.get(CONF_TIMEOUT, DEFAULT_TIMEOUT)
+        api.retry_policy = replace(
+            api.retry_policy,
+            connection_attempts=options.get(
+                CONF_RETRY_ATTEMPTS, DEFAULT_CONNECTION_ATTEMPTS
+            ),
+        )
+        cache_ttl = options.get(CONF_CACHE_TTL, DEFAULT_CACHE_TTL)
+        if cache_ttl != api.cache_ttl:
+            # Entries cached under the old TTL would outlive a shorter one
+            api.invalidate_cache()
+            api.cache_ttl = cache_ttl
+
+        # Without the option the scheduler picks the interval by opening hours
+        open_interval = None
+        if (minutes := options.get(CONF_SCAN_INTERVAL)) is not None:
+            open_interval = timedelta(minutes=minutes)
+        stale_grace = DEFAULT_STALE_GRACE
+        if (minutes := options.get(CONF_STALE_GRACE)) is not None:
+            stale_grace = timedelta(minutes=minutes)
+        text = options.get(CONF_OPENING_HOURS, DEFAULT_OPENING_HOURS)
+        try:
+            opening_hours = OpeningHours.from_text(text)
+        except ValueError as err:
+            _LOGGER.warning("Ignoring invalid opening hours %r: %s", text, err)
+            opening_hours = None
+        # Samples are kept or replaced as a whole, so the percentage alone
+        # decides; the counts follow it instead of needing deadbands of their own
+        deadband = options.get(CONF_OCCUPANCY_DEADBAND, DEFAULT_OCCUPANCY_DEADBAND)
+        deadbands = (
+            {"free": math.inf, "occupied": math.inf, "percentage": deadband}
+            if deadband
+            else {}
+        )
+        for coordinator in self.coordinators.values():
+            coordinator.stale_grace = stale_grace
+            coordinator.deadbands = deadbands
+            if coordinator.scheduler is not None:
+                coordinator.scheduler.open_interval = open_interval
+                coordinator.scheduler.opening_hours = opening_hours
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -9,7 +10,7 @@ from homeassistant.core import HomeAssistant
 from homeassistant.components.diagnostics import async_redact_data
 
 from .const import DOMAIN
-from .coordinator import PhoenixBadCoordinator
+from .coordinator import PhoenixBadRuntimeData
 
 TO_REDACT = {
     "entry_id",
@@ -20,15 +21,34 @@ async def async_get_config_entry_diagnostics(
     hass: HomeAssistant, entry: ConfigEntry
 ) -> dict[str, Any]:
     """Return diagnostics for a config entry."""
-    coordinator: PhoenixBadCoordinator = hass.data[DOMAIN][entry.entry_id]
+    runtime_data: PhoenixBadRuntimeData = hass.data[DOMAIN][entry.entry_id]
+    api = runtime_data.api
 
     diagnostics_data = {
         "config_entry": async_redact_data(entry.as_dict(), TO_REDACT),
         "coordinator_data": {},
+        "coordinators": {},
+        "request_metrics": api.metrics.as_dict(),
+        "api_stats": {area: asdict(stats) for area, stats in api.stats.items()},
+        "cache_stats": api.cache_stats,
+        "connection_stats": api.connection_stats,
+        "startup_timings": runtime_data.startup_timings,
     }
 
-    if coordinator.data:
-        for area, data in coordinator.data.items():
+    for key, coordinator in runtime_data.coordinators.items():
+        diagnostics_data["coordinators"][key] = {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": str(coordinator.update_interval),
+            "suppressed_updates": coordinator.suppressed_updates,
+            "startup_timings": coordinator.startup_timings,
+            "last_fetched": {
+                area: fetched.isoformat()
+                for area, fetched in coordinator.last_fetched.items()
+            },
+            "stale_areas": sorted(coordinator.stale_areas),
+            "stale_grace": str(coordinator.stale_grace),
+        }
+        for area, data in (coordinator.data or {}).items():
             diagnostics_data["coordinator_data"][area] = {
                 "free": data.free,
                 "occupied": data.occupied,
@@ -0,0 +1,180 @@
+"""Weekday and time-of-day occupancy forecast for Phoenix-Bad.
+
+Every open sample is folded into a cell of a weekday × time-slot matrix
+that keeps the sample count, the running mean and a fixed histogram of the
+percentage. Updates and lookups touch a single cell, so both take constant
+time however much history has been seen.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, NamedTuple
+
+from .api import OccupancyData
+
+SLOT_MINUTES = 30
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+CELLS = 7 * SLOTS_PER_DAY
+# Histogram of 5 percentage point bins per cell, used for quantiles
+BIN_WIDTH = 5.0
+BINS = int(100 / BIN_WIDTH)
+
+
+class ForecastCell(NamedTuple):
+    """Occupancy statistics of one weekday and time slot."""
+
+    samples: int
+    mean: float | None
+    p10: float | None
+    p50: float | None
+    p90: float | None
+
+
+def slot_index(when: datetime) -> int:
+    """Return the matrix cell of a local time."""
+    minute = when.hour * 60 + when.minute
+    return when.weekday() * SLOTS_PER_DAY + minute // SLOT_MINUTES
+
+
+def _quantile(bins: Sequence[int], samples: int, quantile: float) -> float:
+    """Return a quantile interpolated within the histogram bins."""
+    target = quantile * samples
+    cumulative = 0
+    for index, count in enumerate(bins):
+        if count and cumulative + count >= target:
+            return round((index + (target - cumulative) / count) * BIN_WIDTH, 2)
+        cumulative += count
+    return 100.0
+
+
+class ForecastMatrix:
+    """Weekday × time-slot occupancy statistics of one area."""
+
+    __slots__ = ("bins", "counts", "means")
+
+    def __init__(self) -> None:
+        """Initialize an empty matrix."""
+        self.counts = array("I", [0]) * CELLS
+        self.means = array("d", [0.0]) * CELLS
+        self.bins = array("I", [0]) * (CELLS * BINS)
+
+    def add(self, when: datetime, percentage: float) -> None:
+        """Fold a sample into the cell of its local time.
+
+        Args:
+            when: Local time the sample was taken
+            percentage: Occupancy percentage (0-100)
+        """
+        index = slot_index(when)
+        count = self.counts[index] + 1
+        self.counts[index] = count
+        self.means[index] += (percentage - self.means[index]) / count
+        bin_index = min(BINS - 1, max(0, int(percentage // BIN_WIDTH)))
+        self.bins[index * BINS + bin_index] += 1
+
+    def cell(self, index: int) -> ForecastCell:
+        """Return the statistics of a cell."""
+        if not (samples := self.counts[index]):
+            return ForecastCell(0, None, None, None, None)
+        bins = self.bins[index * BINS : (index + 1) * BINS]
+        return ForecastCell(
+            samples,
+            round(self.means[index], 2),
+            _quantile(bins, samples, 0.1),
+            _quantile(bins, samples, 0.5),
+            _quantile(bins, samples, 0.9),
+        )
+
+    def at(self, when: datetime) -> ForecastCell:
+        """Return the statistics for a local time."""
+        return self.cell(slot_index(when))
+
+    def as_dict(self) -> dict[str, list[Any]]:
+        """Serialize the matrix for storage."""
+        return {
+            "counts": self.counts.tolist(),
+            "means": self.means.tolist(),
+            "bins": self.bins.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Sequence[Any]]) -> ForecastMatrix:
+        """Deserialize a stored matrix.
+
+        Raises:
+            ValueError: If the stored layout does not match this version
+        """
+        matrix = cls()
+        for name, size in (("counts", CELLS), ("means", CELLS), ("bins", CELLS * BINS)):
+            values = data.get(name, ())
+            if len(values) != size:
+                raise ValueError(f"Stored forecast {name} has {len(values)} values")
+            getattr(matrix, name)[:] = array(getattr(matrix, name).typecode, values)
+        return matrix
+
+
+class OccupancyForecast:
+    """Forecast matrices keyed by area."""
+
+    def __init__(self, matrices: Mapping[str, ForecastMatrix] | None = None) -> None:
+        """Initialize the forecast.
+
+        Args:
+            matrices: Previously built matrices keyed by area
+        """
+        self.matrices: dict[str, ForecastMatrix] = dict(matrices or {})
+
+    def add(self, area: str, when: datetime, data: OccupancyData) -> bool:
+        """Fold a sample into the area's matrix.
+
+        Samples of closed areas are skipped, as they would drag the
+        forecast for the opening hours towards zero.
+
+        Args:
+            area: Area key
+            when: Local time the sample was taken
+            data: Fetched occupancy
+
+        Returns:
+            True if the sample was used
+        """
+        if not data.total:
+            return False
+        self.add_percentage(area, when, data.percentage)
+        return True
+
+    def add_percentage(self, area: str, when: datetime, percentage: float) -> None:
+        """Fold a bare occupancy percentage into the area's matrix.
+
+        Args:
+            area: Area key
+            when: Local time the percentage was observed
+            percentage: Occupancy percentage (0-100) of an open area
+        """
+        if (matrix := self.matrices.get(area)) is None:
+            matrix = self.matrices[area] = ForecastMatrix()
+        matrix.add(when, percentage)
+
+    def at(self, area: str, when: datetime) -> ForecastCell:
+        """Return the forecast of an area for a local time."""
+        if (matrix := self.matrices.get(area)) is None:
+            return ForecastCell(0, None, None, None, None)
+        return matrix.at(when)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Serialize the forecast for storage."""
+        return {area: matrix.as_dict() for area, matrix in self.matrices.items()}
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> OccupancyForecast:
+        """Deserialize a stored forecast; areas that do not fit start empty."""
+        matrices = {}
+        for area, stored in data.items():
+            try:
+                matrices[area] = ForecastMatrix.from_dict(stored)
+            except (AttributeError, TypeError, ValueError, OverflowError):
+                continue
+        return cls(matrices)
@@ -0,0 +1,284 @@
+"""Fixed-size binary occupancy history for Phoenix-Bad.
+
+Each area gets one file holding a header and a ring of fixed-size records.
+The file is sized for its capacity when created, so disk use never grows;
+once the ring is full the oldest records are overwritten.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+import logging
+import mmap
+from pathlib import Path
+import struct
+from typing import BinaryIO, NamedTuple, Self
+
+_LOGGER = logging.getLogger(__name__)
+
+MAGIC = b"PBH1"
+# magic, version, record size, capacity, head (next write slot), count,
+# padded so records stay 8-byte aligned
+HEADER = struct.Struct("<4sHHIII4x")
+# timestamp (Unix seconds), free, occupied, percentage (single precision)
+RECORD = struct.Struct("<dHHf")
+VERSION = 1
+
+# Four weeks of 5 minute polls in about 128 KiB per area
+DEFAULT_CAPACITY = 8064
+
+
+class HistoryRecord(NamedTuple):
+    """A single occupancy sample."""
+
+    timestamp: float
+    free: int
+    occupied: int
+    percentage: float
+
+
+def _file_size(capacity: int) -> int:
+    """Return the size of a history file with the given capacity."""
+    return HEADER.size + capacity * RECORD.size
+
+
+class OccupancyHistory:
+    """Append-only ring buffer of occupancy records in a single file.
+
+    Writes are blocking and meant to run in an executor, batched. Records
+    are expected in chronological order; time-range reads rely on it.
+    """
+
+    def __init__(self, path: Path, capacity: int = DEFAULT_CAPACITY) -> None:
+        """Initialize the history.
+
+        Args:
+            path: File holding the ring buffer; created on first write
+            capacity: Number of records kept before the oldest is overwritten
+
+        Raises:
+            ValueError: If capacity is not positive
+        """
+        if capacity <= 0:
+            raise ValueError("History capacity must be positive")
+        self.path = path
+        self.capacity = capacity
+
+    def _read_header(self, file: BinaryIO) -> tuple[int, int] | None:
+        """Return (head, count) if the file matches this history's layout."""
+        file.seek(0)
+        raw = file.read(HEADER.size)
+        if len(raw) != HEADER.size:
+            return None
+        *layout, head, count = HEADER.unpack(raw)
+        if layout != [MAGIC, VERSION, RECORD.size, self.capacity]:
+            return None
+        if head >= self.capacity or count > self.capacity:
+            return None
+        return head, count
+
+    def _write_header(self, file: BinaryIO, head: int, count: int) -> None:
+        """Write the header."""
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, VERSION, RECORD.size, self.capacity, head, count))
+
+    def append(self, records: Sequence[HistoryRecord]) -> None:
+        """Append a batch of records, overwriting the oldest when full.
+
+        A file with a different layout or capacity is replaced by an empty
+        ring.
+
+        Args:
+            records: Records in chronological order
+        """
+        if not records:
+            return
+        records = records[-self.capacity :]
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        with open(self.path, "r+b") as file:
+            if (state := self._read_header(file)) is None:
+                if self.path.stat().st_size:
+                    _LOGGER.warning("Resetting incompatible history %s", self.path)
+                file.truncate(0)
+                file.truncate(_file_size(self.capacity))
+                state = (0, 0)
+            head, count = state
+
+            buffer = bytearray(len(records) * RECORD.size)
+            for index, record in enumerate(records):
+                RECORD.pack_into(buffer, index * RECORD.size, *record)
+
+            # Once the ring is full the batch overwrites the oldest records;
+            # drop them from the header first, so a crash never exposes
+            # half-written records as valid ones
+            overwritten = max(0, count + len(records) - self.capacity)
+            if overwritten:
+                self._write_header(file, head, count - overwritten)
+                file.flush()
+
+            # At most two contiguous writes: up to the end of the ring, then
+            # the remainder from its start
+            first = min(len(records), self.capacity - head)
+            file.seek(HEADER.size + head * RECORD.size)
+            file.write(buffer[: first * RECORD.size])
+            if first < len(records):
+                file.seek(HEADER.size)
+                file.write(buffer[first * RECORD.size :])
+            file.flush()
+            # Header last, so a crash loses at most the batch and the records
+            # it was about to overwrite
+            self._write_header(
+                file,
+                (head + len(records)) % self.capacity,
+                min(self.capacity, count + len(records)),
+            )
+
+    def oldest_timestamp(self) -> float | None:
+        """Return the timestamp of the oldest stored record, if any."""
+        with self.reader() as reader:
+            return reader._timestamp(0) if len(reader) else None
+
+    def backfill(self, records: Sequence[HistoryRecord]) -> int:
+        """Insert records older than the stored history.
+
+        The ring is rewritten into a temporary file that then replaces the
+        original, so readers never see a partial result. When the combined
+        history exceeds the capacity the oldest records are dropped.
+
+        Args:
+            records: Records in chronological order; those not older than
+                the oldest stored record are ignored
+
+        Returns:
+            Number of records inserted
+        """
+        with self.reader() as reader:
+            existing = list(reader.records())
+        if existing:
+            oldest = existing[0].timestamp
+            records = [record for record in records if record.timestamp < oldest]
+        combined = [*records, *existing][-self.capacity :]
+        if len(combined) == len(existing):
+            return 0
+
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        temporary.unlink(missing_ok=True)
+        OccupancyHistory(temporary, self.capacity).append(combined)
+        temporary.replace(self.path)
+        return len(combined) - len(existing)
+
+    def reader(self) -> HistoryReader:
+        """Return a memory-mapped reader; use it as a context manager."""
+        return HistoryReader(self)
+
+    def remove(self) -> None:
+        """Delete the history file."""
+        self.path.unlink(missing_ok=True)
+
+
+class HistoryReader:
+    """Zero-copy, memory-mapped view of an OccupancyHistory.
+
+    The view reflects the history when the reader was opened. Memoryviews
+    returned by segments() must be released, and records() iterators
+    exhausted or closed, before the reader is closed.
+    """
+
+    def __init__(self, history: OccupancyHistory) -> None:
+        """Map the history file, or present an empty view if there is none."""
+        self._mmap: mmap.mmap | None = None
+        self._records = memoryview(b"")
+        self._capacity = history.capacity
+        self._start = 0
+        self._count = 0
+
+        try:
+            with open(history.path, "rb") as file:
+                if (state := history._read_header(file)) is None:
+                    return
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return
+
+        head, self._count = state
+        self._start = (head - self._count) % self._capacity
+        self._records = memoryview(self._mmap)[HEADER.size : _file_size(self._capacity)]
+
+    def __enter__(self) -> Self:
+        """Return the reader."""
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        """Close the reader."""
+        self.close()
+
+    def close(self) -> None:
+        """Release the mapping."""
+        self._records.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __len__(self) -> int:
+        """Return the number of stored records."""
+        return self._count
+
+    def _timestamp(self, index: int) -> float:
+        """Return the timestamp of the record at a chronological index."""
+        slot = (self._start + index) % self._capacity
+        return RECORD.unpack_from(self._records, slot * RECORD.size)[0]
+
+    def _bisect(self, timestamp: float) -> int:
+        """Return the index of the first record at or after timestamp."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._timestamp(middle) < timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def segments(
+        self, start: float | None = None, end: float | None = None
+    ) -> list[memoryview]:
+        """Return the raw records within a time range without copying.
+
+        Args:
+            start: First Unix timestamp included (defaults to the oldest)
+            end: Unix timestamp at which the range ends, exclusive (defaults
+                to after the newest)
+
+        Returns:
+            One or two contiguous memoryviews of packed RECORD structs, in
+            chronological order
+        """
+        first = 0 if start is None else self._bisect(start)
+        last = self._count if end is None else self._bisect(end)
+        if first >= last:
+            return []
+
+        slot = (self._start + first) % self._capacity
+        length = last - first
+        head_part = min(length, self._capacity - slot)
+        views = [self._records[slot * RECORD.size : (slot + head_part) * RECORD.size]]
+        if head_part < length:
+            views.append(self._records[: (length - head_part) * RECORD.size])
+        return views
+
+    def records(
+        self, start: float | None = None, end: float | None = None
+    ) -> Iterator[HistoryRecord]:
+        """Yield the records within a time range, oldest first.
+
+        Args:
+            start: First Unix timestamp included (defaults to the oldest)
+            end: Unix timestamp at which the range ends, exclusive (defaults
+                to after the newest)
+        """
+        for view in self.segments(start, end):
+            with view:
+                for offset in range(0, len(view), RECORD.size):
+                    yield HistoryRecord._make(RECORD.unpack_from(view, offset))
@@ -0,0 +1,201 @@
+"""Request phase timing for the Phoenix-Bad API client."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import aiohttp
+
+# Upper bucket bounds in milliseconds; the last bucket collects everything above
+BUCKET_BOUNDS_MS: tuple[float, ...] = (
+    1,
+    2,
+    5,
+    10,
+    20,
+    50,
+    100,
+    200,
+    500,
+    1000,
+    2000,
+    5000,
+    10000,
+    20000,
+)
+
+PHASES: tuple[str, ...] = ("dns", "connect", "ttfb", "body", "parse")
+
+
+class LatencyHistogram:
+    """Fixed-size latency histogram with exponential buckets."""
+
+    __slots__ = ("count", "counts", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        """Record a duration.
+
+        Args:
+            seconds: Duration in seconds
+        """
+        millis = seconds * 1000
+        self.counts[bisect_left(BUCKET_BOUNDS_MS, millis)] += 1
+        self.count += 1
+        self.total += millis
+        self.max = max(self.max, millis)
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return an upper bound for the given percentile in milliseconds.
+
+        Args:
+            fraction: Percentile as a fraction (0-1)
+
+        Returns:
+            Upper bound of the bucket holding the percentile, the observed
+            maximum for the overflow bucket, or None without samples
+        """
+        if not self.count:
+            return None
+
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                if index < len(BUCKET_BOUNDS_MS):
+                    return min(BUCKET_BOUNDS_MS[index], self.max)
+                break
+        return self.max
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a summary suitable for diagnostics."""
+        labels = [f"le_{bound:g}ms" for bound in BUCKET_BOUNDS_MS] + ["inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total / self.count, 3) if self.count else None,
+            "max_ms": round(self.max, 3),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class RequestMetrics:
+    """Per-area latency histograms for each request phase."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self._areas: dict[str, dict[str, LatencyHistogram]] = {}
+
+    def observe(self, area_name: str, phase: str, seconds: float) -> None:
+        """Record the duration of a request phase.
+
+        Args:
+            area_name: Name of the area
+            phase: One of PHASES
+            seconds: Duration in seconds
+        """
+        if (phases := self._areas.get(area_name)) is None:
+            phases = self._areas[area_name] = {
+                name: LatencyHistogram() for name in PHASES
+            }
+        phases[phase].observe(seconds)
+
+    def histogram(self, area_name: str, phase: str) -> LatencyHistogram | None:
+        """Return the histogram for an area and phase, if any was recorded."""
+        return self._areas.get(area_name, {}).get(phase)
+
+    def as_dict(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Return all histograms suitable for diagnostics."""
+        return {
+            area_name: {name: hist.as_dict() for name, hist in phases.items()}
+            for area_name, phases in self._areas.items()
+        }
+
+
+class RequestTrace:
+    """Connection-level timings collected for a single request."""
+
+    __slots__ = ("_connect_start", "_dns_start", "connect", "created", "dns", "reused")
+
+    def __init__(self) -> None:
+        """Initialize an empty trace."""
+        self.dns: float | None = None
+        self.connect: float | None = None
+        self.created = False
+        self.reused = False
+        self._dns_start = 0.0
+        self._connect_start = 0.0
+
+
+def _request_trace(trace_config_ctx: SimpleNamespace) -> RequestTrace | None:
+    """Return the RequestTrace passed as trace_request_ctx, if any."""
+    trace = trace_config_ctx.trace_request_ctx
+    return trace if isinstance(trace, RequestTrace) else None
+
+
+async def _on_dns_resolvehost_start(
+    session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+) -> None:
+    """Mark the start of DNS resolution."""
+    if trace := _request_trace(ctx):
+        trace._dns_start = time.perf_counter()
+
+
+async def _on_dns_resolvehost_end(
+    session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+) -> None:
+    """Record the DNS resolution time."""
+    if trace := _request_trace(ctx):
+        trace.dns = time.perf_counter() - trace._dns_start
+
+
+async def _on_connection_create_start(
+    session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+) -> None:
+    """Mark the start of connection setup."""
+    if trace := _request_trace(ctx):
+        trace._connect_start = time.perf_counter()
+
+
+async def _on_connection_create_end(
+    session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+) -> None:
+    """Record the TCP/TLS connect time."""
+    if trace := _request_trace(ctx):
+        trace.created = True
+        # DNS resolution happens while the connection is being created
+        trace.connect = time.perf_counter() - trace._connect_start - (trace.dns or 0)
+
+
+async def _on_connection_reuseconn(
+    session: aiohttp.ClientSession, ctx: SimpleNamespace, params: Any
+) -> None:
+    """Flag a request served over a pooled connection."""
+    if trace := _request_trace(ctx):
+        trace.reused = True
+
+
+def create_trace_config() -> aiohttp.TraceConfig:
+    """Return a trace config that fills RequestTrace objects.
+
+    The config only records requests made with a RequestTrace as
+    trace_request_ctx, so it can be attached to a shared session.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+    trace_config.on_connection_create_start.append(_on_connection_create_start)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(_on_connection_reuseconn)
+    return trace_config
@@ -0,0 +1,231 @@
+"""Parser engines for Phoenix-Bad updateLiveVisitors responses."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import html as html_lib
+import re
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Attribute value, quoted or unquoted; the matching group holds the value.
+_VALUE = r"""\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))"""
+# Comments and script/style bodies, whose text may look like tags; an
+# unterminated one runs to the end of the document.
+_IGNORED_RE = re.compile(
+    r"<!--.*?(?:-->|$)|<(script|style)\b[^>]*>.*?(?:</\1\s*>|$)",
+    re.DOTALL | re.IGNORECASE,
+)
+_IGNORED_START_RE = re.compile(r"<(?:!--|script\b|style\b)", re.IGNORECASE)
+_DATA_FREE_RE = re.compile(rf"data-free(?<![-\w]data-free){_VALUE}", re.IGNORECASE)
+_STYLE_RE = re.compile(rf"style(?<![-\w]style){_VALUE}", re.IGNORECASE)
+_CLASS_RE = re.compile(rf"class(?<![-\w]class){_VALUE}", re.IGNORECASE)
+_DIV_RE = re.compile(r"<div[\s/>]", re.IGNORECASE)
+_OUTER_WRAPPER_RE = re.compile(r"\bouter_wrapper\b")
+_INNER_WRAPPER_RE = re.compile(r"\binner_wrapper\b")
+# The occupied percentage; max-width and friends are not it. The lookbehinds
+# follow the literal so the regex engine can still scan for it quickly.
+WIDTH_RE = re.compile(r"width(?<![-\w]width):\s*([\d.]+)%")
+_STYLE_WIDTH_RE = re.compile(r"width")
+
+
+class RawOccupancy(NamedTuple):
+    """Raw attribute values extracted from a response.
+
+    Attributes:
+        data_free: Value of the data-free attribute, None if the occupancy
+            element exists but has no data-free attribute
+        width: Occupied percentage from the width style, None if not present
+    """
+
+    data_free: str | None
+    width: str | None
+
+
+ParserEngine = Callable[[str], RawOccupancy | None]
+
+
+def _attribute(match: re.Match[str]) -> str:
+    """Return the unescaped value of an attribute matched with _VALUE."""
+    # Only one of the alternatives matches, and it is the last group that did
+    value = match[match.lastindex or 0]
+    return html_lib.unescape(value) if "&" in value else value
+
+
+def _strip_ignored(html: str) -> str:
+    """Return the markup without comments and script/style bodies."""
+    return _IGNORED_RE.sub("", html) if _IGNORED_START_RE.search(html) else html
+
+
+def _in_tag(markup: str, position: int) -> bool:
+    """Return whether a position lies within a tag rather than in text."""
+    return markup.rfind("<", 0, position) > markup.rfind(">", 0, position)
+
+
+def _search_in_tag(
+    pattern: re.Pattern[str], markup: str, start: int
+) -> re.Match[str] | None:
+    """Return the first match after start that lies within a tag."""
+    while (match := pattern.search(markup, start)) is not None:
+        if _in_tag(markup, match.start()):
+            return match
+        start = match.end()
+    return None
+
+
+def _outer_wrapper(markup: str) -> tuple[int, int] | None:
+    """Return where the first div classed outer_wrapper starts and ends.
+
+    Returns:
+        Offsets of the tag's "<" and ">", the latter being the length of
+        the markup if the tag is incomplete, or None if there is no such div
+    """
+    start = 0
+    while (match := _search_in_tag(_OUTER_WRAPPER_RE, markup, start)) is not None:
+        tag_start = markup.rfind("<", 0, match.start())
+        if (tag_end := markup.find(">", match.end())) < 0:
+            tag_end = len(markup)
+        classes = _CLASS_RE.search(markup, tag_start, tag_end)
+        if (
+            _DIV_RE.match(markup, tag_start)
+            and classes is not None
+            and "outer_wrapper" in _attribute(classes).split()
+        ):
+            return tag_start, tag_end
+        start = match.end()
+    return None
+
+
+def _inner_style(markup: str, start: int) -> str | None:
+    """Return the style of the element the soup cascade reads the width from.
+
+    That is the inner_wrapper element after start or, failing that, the
+    first element after start styled with a width.
+    """
+    if (inner := _search_in_tag(_INNER_WRAPPER_RE, markup, start)) is not None:
+        tag_end = markup.find(">", inner.end())
+        style = _STYLE_RE.search(
+            markup,
+            markup.rfind("<", 0, inner.start()),
+            len(markup) if tag_end < 0 else tag_end,
+        )
+        return _attribute(style) if style else ""
+    while (style := _search_in_tag(_STYLE_RE, markup, start)) is not None:
+        if "width" in (value := _attribute(style)):
+            return value
+        start = style.end()
+    return None
+
+
+def parse_fast(html: str) -> RawOccupancy | None:
+    """Extract occupancy values with precompiled regular expressions.
+
+    Mirrors the soup cascade, ignoring comments and script/style bodies: the
+    first div classed outer_wrapper, or else the first tag with a data-free
+    attribute, is the outer element. The width is read from the style of
+    the inner_wrapper element after it, or of the first element after it
+    styled with a width, falling back to the whole document.
+
+    Args:
+        html: HTML response text
+
+    Returns:
+        RawOccupancy, or None if no outer element was found
+    """
+    markup = _strip_ignored(html)
+    if (wrapper := _outer_wrapper(markup)) is not None:
+        tag_start, start = wrapper
+        free = _DATA_FREE_RE.search(markup, tag_start, start)
+        data_free = _attribute(free) if free else None
+    elif (outer := _search_in_tag(_DATA_FREE_RE, markup, 0)) is not None:
+        data_free, start = _attribute(outer), outer.end()
+    else:
+        return None
+
+    style = _inner_style(markup, start)
+    width_match = WIDTH_RE.search(html if style is None else style)
+    return RawOccupancy(data_free, width_match.group(1) if width_match else None)
+
+
+def has_occupancy_values(body: bytes | bytearray) -> bool:
+    """Return whether a (partial) body contains both occupancy values.
+
+    Only the outer_wrapper element counts: the body is complete enough once
+    it holds the whole tag of the first one and the whole inner_wrapper tag
+    after it, as nothing received later can change what parse_fast reads.
+
+    Args:
+        body: Raw response bytes received so far
+
+    Returns:
+        True once both tags have been seen outside comments and scripts
+    """
+    if b"inner_wrapper" not in body:
+        return False
+    markup = _strip_ignored(bytes(body).decode("utf-8", "replace"))
+    if (wrapper := _outer_wrapper(markup)) is None:
+        return False
+    inner = _search_in_tag(_INNER_WRAPPER_RE, markup, wrapper[1])
+    return inner is not None and markup.find(">", inner.end()) >= 0
+
+
+def _soup_class() -> type[BeautifulSoup]:
+    """Import BeautifulSoup on first use.
+
+    The import is comparatively heavy and only needed when the fast path
+    finds nothing, so it is kept out of integration startup.
+    """
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup
+
+
+def parse_soup(html: str) -> RawOccupancy | None:
+    """Extract occupancy values with the BeautifulSoup selector cascade.
+
+    Args:
+        html: HTML response text
+
+    Returns:
+        RawOccupancy, or None if no occupancy element was found
+    """
+    soup = _soup_class()(html, "html.parser")
+
+    # Find the outer wrapper div with data-free attribute
+    # We first try the specific class, then fall back to any element with data-free
+    outer_div = soup.find("div", class_="outer_wrapper") or soup.find(
+        attrs={"data-free": True}
+    )
+    if not outer_div:
+        return None
+
+    data_free = outer_div.get("data-free")
+    if isinstance(data_free, list):
+        data_free = data_free[0] if data_free else "0"
+
+    # We look for the inner_wrapper, but fall back to searching children for width
+    inner_div = outer_div.find("div", class_="inner_wrapper") or outer_div.find(
+        attrs={"style": _STYLE_WIDTH_RE}
+    )
+
+    if not inner_div:
+        # No visitors or different structure, try to find width in whole HTML
+        width_match = WIDTH_RE.search(html)
+    else:
+        width_match = WIDTH_RE.search(str(inner_div.get("style", "")))
+
+    return RawOccupancy(
+        None if data_free is None else str(data_free),
+        width_match.group(1) if width_match else None,
+    )
+
+
+PARSER_ENGINES: dict[str, ParserEngine] = {
+    "fast": parse_fast,
+    "soup": parse_soup,
+}
+
+DEFAULT_PARSER = "fast"
+FALLBACK_PARSER = "soup"
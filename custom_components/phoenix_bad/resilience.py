@@ -0,0 +1,162 @@
+"""Retry, circuit breaker and rate limiting policies for the Phoenix-Bad API client."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from enum import StrEnum
+import random
+import time
+
+DEFAULT_CONNECTION_ATTEMPTS = 3
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Bounded retries with exponential backoff and jitter.
+
+    Attributes:
+        connection_attempts: Total attempts for connection errors and timeouts
+        parse_attempts: Total attempts for unparseable responses
+        base_delay: Delay in seconds before the first retry
+        max_delay: Upper bound for a single delay in seconds
+        jitter: Fraction of each delay that is randomized (0-1)
+    """
+
+    connection_attempts: int = DEFAULT_CONNECTION_ATTEMPTS
+    parse_attempts: int = 1
+    base_delay: float = 1.0
+    max_delay: float = 30.0
+    jitter: float = 0.5
+
+    def delay(self, attempt: int) -> float:
+        """Return the delay before the given retry.
+
+        Args:
+            attempt: Number of the attempt that just failed (1-based)
+
+        Returns:
+            Delay in seconds
+        """
+        backoff = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        return backoff * (1 - self.jitter * random.random())
+
+
+NO_RETRY = RetryPolicy(connection_attempts=1, parse_attempts=1)
+
+
+class CircuitState(StrEnum):
+    """States of a circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while an endpoint keeps failing.
+
+    After failure_threshold consecutive failures the circuit opens and
+    requests are rejected without network I/O. Once recovery_timeout has
+    passed a single probe request is let through; its outcome closes or
+    re-opens the circuit.
+    """
+
+    def __init__(
+        self, failure_threshold: int = 3, recovery_timeout: float = 300
+    ) -> None:
+        """Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            recovery_timeout: Seconds to stay open before probing again
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> CircuitState:
+        """Return the current circuit state."""
+        if self._opened_at is None:
+            return CircuitState.CLOSED
+        if time.monotonic() - self._opened_at >= self.recovery_timeout:
+            return CircuitState.HALF_OPEN
+        return CircuitState.OPEN
+
+    def allow_request(self) -> bool:
+        """Return whether a request may be sent now.
+
+        In the half-open state only the first caller is allowed through.
+        """
+        state = self.state
+        if state is CircuitState.CLOSED:
+            return True
+        if state is CircuitState.HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """Allow a new probe if the current one ended without an outcome."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        """Count a failed request and open the circuit if needed."""
+        self.failures += 1
+        self._probing = False
+        if self._opened_at is not None or self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+class TokenBucket:
+    """Rate limiter that queues callers instead of rejecting them.
+
+    Every acquire reserves the next token, letting the balance go negative,
+    and waits until that token would have been refilled. Callers are thus
+    served in arrival order at no more than rate per second after an
+    initial burst. A cancelled waiter keeps its reservation.
+    """
+
+    def __init__(self, rate: float, burst: float = 1) -> None:
+        """Initialize the bucket.
+
+        Args:
+            rate: Tokens refilled per second
+            burst: Tokens available at once when the bucket is full
+
+        Raises:
+            ValueError: If rate or burst is not positive
+        """
+        if rate <= 0 or burst <= 0:
+            raise ValueError("Token bucket rate and burst must be positive")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def reserve(self) -> float:
+        """Take a token and return the seconds to wait before using it."""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self.rate)
+
+    async def acquire(self) -> float:
+        """Wait for a token.
+
+        Returns:
+            Seconds spent waiting
+        """
+        if delay := self.reserve():
+            await asyncio.sleep(delay)
+        return delay
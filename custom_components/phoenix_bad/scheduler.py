@@ -0,0 +1,307 @@
+"""Opening-hours aware adaptive polling schedule for Phoenix-Bad."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime, time, timedelta
+import hashlib
+import logging
+
+from .api import OccupancyData
+from .const import (
+    CLOSED_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    MAX_CLOSED_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    OPEN_SCAN_INTERVAL,
+    TARGET_CHANGE_PER_POLL,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+# Weekday (0 = Monday) -> opening periods as (open, close) local times
+OpeningPeriods = tuple[tuple[time, time], ...]
+
+
+def parse_opening_hours(spec: Mapping[str, str]) -> dict[int, OpeningPeriods]:
+    """Parse an opening-hours table.
+
+    Args:
+        spec: Mapping of weekday abbreviations to "HH:MM-HH:MM" periods
+            separated by commas; missing or empty days are closed
+
+    Returns:
+        Opening periods per weekday, Monday being 0
+
+    Raises:
+        ValueError: If a weekday or period is invalid
+    """
+    if unknown := set(spec) - set(WEEKDAYS):
+        raise ValueError(f"Unknown weekdays: {', '.join(sorted(unknown))}")
+
+    table: dict[int, OpeningPeriods] = {}
+    for weekday, day in enumerate(WEEKDAYS):
+        periods = []
+        for period in filter(None, spec.get(day, "").replace(" ", "").split(",")):
+            start, sep, end = period.partition("-")
+            if not sep:
+                raise ValueError(f"Invalid opening period for {day}: {period}")
+            opens, closes = time.fromisoformat(start), time.fromisoformat(end)
+            if closes <= opens:
+                raise ValueError(f"Opening period for {day} ends before it starts")
+            periods.append((opens, closes))
+        table[weekday] = tuple(sorted(periods))
+    return table
+
+
+def _weekday_index(day: str) -> int:
+    """Return the index of a weekday abbreviation, Monday being 0."""
+    try:
+        return WEEKDAYS.index(day)
+    except ValueError:
+        raise ValueError(f"Unknown weekday: {day}") from None
+
+
+def parse_opening_hours_text(text: str) -> dict[str, str]:
+    """Parse opening hours as entered in the options flow into a table.
+
+    The text lists days and their periods, entries separated by
+    semicolons, e.g. "mon-fri 07:00-22:00; sat,sun 08:00-12:00, 14:00-20:00".
+    Day ranges may wrap around the week; days not listed are closed.
+
+    Args:
+        text: Opening hours text
+
+    Returns:
+        Opening-hours table for parse_opening_hours
+
+    Raises:
+        ValueError: If a day or period is invalid
+    """
+    table: dict[str, list[str]] = {}
+    for entry in filter(None, (entry.strip() for entry in text.split(";"))):
+        days, _, periods = entry.partition(" ")
+        if not periods.strip():
+            raise ValueError(f"No opening periods for {days}")
+        for part in days.lower().split(","):
+            first, sep, last = part.partition("-")
+            start = _weekday_index(first)
+            end = _weekday_index(last) if sep else start
+            for offset in range((end - start) % 7 + 1):
+                table.setdefault(WEEKDAYS[(start + offset) % 7], []).append(periods)
+    spec = {day: ",".join(periods) for day, periods in table.items()}
+    # Validate the periods as well
+    parse_opening_hours(spec)
+    return spec
+
+
+class OpeningHours:
+    """Weekly opening hours in local time."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self, spec: Mapping[str, str]) -> None:
+        """Initialize the opening hours.
+
+        Args:
+            spec: Opening-hours table, see parse_opening_hours
+        """
+        self._table = parse_opening_hours(spec)
+
+    @classmethod
+    def from_text(cls, text: str) -> OpeningHours | None:
+        """Return the opening hours described by a text, None if it is empty.
+
+        Raises:
+            ValueError: If the text is invalid, see parse_opening_hours_text
+        """
+        if not text.strip():
+            return None
+        return cls(parse_opening_hours_text(text))
+
+    def is_open(self, at: datetime) -> bool:
+        """Return whether the facility is open at the given local time."""
+        now = at.time()
+        return any(opens <= now < closes for opens, closes in self._table[at.weekday()])
+
+    def next_opening(self, at: datetime) -> datetime | None:
+        """Return the next opening after the given local time.
+
+        Returns:
+            Start of the next opening period, or None if the facility is
+            never open
+        """
+        for offset in range(8):
+            day = at.date() + timedelta(days=offset)
+            for opens, _ in self._table[day.weekday()]:
+                opening = datetime.combine(day, opens, tzinfo=at.tzinfo)
+                if opening > at:
+                    return opening
+        return None
+
+
+def install_phase(seed: str) -> float:
+    """Return a stable phase in [0, 1) derived from a seed.
+
+    Installs seed it with their config entry id, so each one polls at its
+    own offset within the interval but keeps that offset across restarts.
+    """
+    digest = hashlib.blake2b(seed.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") / 2**64
+
+
+class AdaptiveScheduler:
+    """Picks the next polling interval from opening hours and occupancy trends.
+
+    When opening hours are known, the coordinator sleeps outside them until
+    the next opening, polls every open interval while open and polls faster
+    while occupancy changes quickly, so that every poll sees roughly
+    TARGET_CHANGE_PER_POLL percentage points of change. Without them it
+    polls around the clock at the default scan interval and never faster.
+    Either way, areas that keep reporting closed back off exponentially from
+    the closed interval up to the maximum closed interval. All intervals are
+    clamped to MIN_SCAN_INTERVAL and MAX_SCAN_INTERVAL.
+
+    A non-zero phase moves every poll to that fraction of its interval on
+    the wall clock, e.g. phase 0.5 with a 15 minute interval polls at 7:30,
+    22:30, 37:30 and 52:30 past the hour. Installs restarted together thus
+    stay spread out instead of all polling the website at the same moment.
+    """
+
+    def __init__(
+        self,
+        opening_hours: OpeningHours | None = None,
+        *,
+        open_interval: timedelta | None = None,
+        closed_interval: timedelta = CLOSED_SCAN_INTERVAL,
+        max_closed_interval: timedelta = MAX_CLOSED_SCAN_INTERVAL,
+        target_change: float = TARGET_CHANGE_PER_POLL,
+        min_interval: timedelta = MIN_SCAN_INTERVAL,
+        max_interval: timedelta = MAX_SCAN_INTERVAL,
+        phase: float = 0.0,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            opening_hours: Weekly opening hours; None when they are unknown
+            open_interval: Interval while open and occupancy is steady; None
+                uses OPEN_SCAN_INTERVAL with opening hours and
+                DEFAULT_SCAN_INTERVAL without
+            closed_interval: Interval after the first poll reporting every
+                area closed
+            max_closed_interval: Longest interval the closed backoff reaches
+            target_change: Percentage points of change per poll to aim for
+            min_interval: Shortest interval ever returned
+            max_interval: Longest interval ever returned
+            phase: Offset of the polls within their interval as a fraction
+                in [0, 1), see install_phase; 0 disables the alignment
+
+        Raises:
+            ValueError: If phase is outside [0, 1)
+        """
+        if not 0 <= phase < 1:
+            raise ValueError("Scheduler phase must be in [0, 1)")
+        self.opening_hours = opening_hours
+        self.open_interval = open_interval
+        self.closed_interval = closed_interval
+        self.max_closed_interval = max_closed_interval
+        self.target_change = target_change
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.phase = phase
+        # Area key -> (time of sample, percentage)
+        self._previous: dict[str, tuple[datetime, float]] = {}
+        # Polls in a row that reported every area closed
+        self._closed_polls = 0
+
+    @property
+    def steady_interval(self) -> timedelta:
+        """Return the interval while open and occupancy is steady."""
+        if self.open_interval is not None:
+            return self.open_interval
+        if self.opening_hours is None:
+            return DEFAULT_SCAN_INTERVAL
+        return OPEN_SCAN_INTERVAL
+
+    def _clamp(self, interval: timedelta) -> timedelta:
+        """Clamp an interval to the configured bounds."""
+        return max(self.min_interval, min(interval, self.max_interval))
+
+    def _align(self, now: datetime, interval: timedelta) -> timedelta:
+        """Stretch an interval so the poll lands on this scheduler's phase.
+
+        The result is the delay until the next point of the interval grid
+        offset by phase, keeping at least half an interval between polls.
+        """
+        if not self.phase:
+            return interval
+        period = interval.total_seconds()
+        if period <= 0:
+            return interval
+        delay = (self.phase * period - now.timestamp()) % period
+        if delay < period / 2:
+            delay += period
+        return timedelta(seconds=delay)
+
+    def _change_rate(self, now: datetime, data: Mapping[str, OccupancyData]) -> float:
+        """Return the fastest occupancy change in percentage points per minute.
+
+        Also records the samples as the reference for the next call.
+        """
+        rate = 0.0
+        for area, sample in data.items():
+            if not sample.total:
+                self._previous.pop(area, None)
+                continue
+            if (previous := self._previous.get(area)) is not None:
+                seen_at, percentage = previous
+                minutes = (now - seen_at).total_seconds() / 60
+                if minutes > 0:
+                    rate = max(rate, abs(sample.percentage - percentage) / minutes)
+            self._previous[area] = (now, sample.percentage)
+        return rate
+
+    def next_interval(
+        self, now: datetime, data: Mapping[str, OccupancyData] | None
+    ) -> timedelta:
+        """Return how long to wait before the next poll.
+
+        Args:
+            now: Current local time
+            data: Occupancy fetched by the poll that just finished, or None
+                if it failed
+
+        Returns:
+            Interval until the next poll
+        """
+        hours = self.opening_hours
+        if hours is not None and not hours.is_open(now):
+            self._previous.clear()
+            self._closed_polls = 0
+            if (opening := hours.next_opening(now)) is None:
+                return self.max_interval
+            # Spread the first polls after opening over the open interval
+            return self._clamp(opening - now + self.phase * self.steady_interval)
+
+        if data is None:
+            return self._clamp(self._align(now, self.steady_interval))
+
+        if not any(sample.total for sample in data.values()):
+            _LOGGER.debug("All areas report closed")
+            self._previous.clear()
+            interval = self.closed_interval * 2**self._closed_polls
+            if interval < self.max_closed_interval:
+                self._closed_polls += 1
+            interval = min(interval, self.max_closed_interval)
+            return self._clamp(self._align(now, interval))
+
+        self._closed_polls = 0
+        interval = self.steady_interval
+        rate = self._change_rate(now, data)
+        # Polling faster is only paid for by sleeping through known closing times
+        if hours is not None and rate:
+            interval = min(interval, timedelta(minutes=self.target_change / rate))
+        return self._clamp(self._align(now, interval))
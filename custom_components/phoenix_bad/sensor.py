@@ -1,92 +1,234 @@
 """Sensor platform for Phoenix-Bad Ottobrunn."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timedelta
 import logging
+from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.typing import StateType
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
-
-from .const import DOMAIN
-from .coordinator import PhoenixBadCoordinator
+from homeassistant.util import dt as dt_util
+
+from .api import AREAS, Area, OccupancyData
+from .const import (
+    ATTR_FREE,
+    ATTR_OCCUPIED,
+    DEVICE_NAME,
+    DOMAIN,
+    MANUFACTURER,
+    MODEL,
+    WEBSITE_URL,
+)
+from .coordinator import PhoenixBadCoordinator, PhoenixBadRuntimeData
+from .forecast import SLOT_MINUTES
+from .storage import OccupancyForecastStore
 
 _LOGGER = logging.getLogger(__name__)
 
+# Forecast sensors report the expected occupancy this far ahead
+FORECAST_HORIZON = timedelta(hours=1)
+
+
+@dataclass(frozen=True, kw_only=True)
+class PhoenixBadSensorEntityDescription(SensorEntityDescription):
+    """Describes a Phoenix-Bad sensor created for every area."""
+
+    value_fn: Callable[[OccupancyData], StateType]
+    attributes_fn: Callable[[OccupancyData], dict[str, Any]] | None = None
+
+
+# One sensor per area and description; the unique ID of an area's sensor is
+# phoenixbad_{area key}_{description key}
+SENSOR_DESCRIPTIONS: tuple[PhoenixBadSensorEntityDescription, ...] = (
+    PhoenixBadSensorEntityDescription(
+        key="occupancy",
+        translation_key="occupancy",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: round(data.percentage),
+        # Deprecated: the free and occupied sensors replace these attributes,
+        # which are kept until existing automations have moved over
+        attributes_fn=lambda data: {
+            ATTR_FREE: data.free,
+            ATTR_OCCUPIED: data.occupied,
+        },
+    ),
+    PhoenixBadSensorEntityDescription(
+        key="free",
+        translation_key="free",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.free,
+    ),
+    PhoenixBadSensorEntityDescription(
+        key="occupied",
+        translation_key="occupied",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.occupied,
+    ),
+    PhoenixBadSensorEntityDescription(
+        key="total",
+        translation_key="total",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda data: data.total,
+    ),
+)
+
+FORECAST_DESCRIPTION = SensorEntityDescription(
+    key="forecast",
+    translation_key="forecast",
+    native_unit_of_measurement=PERCENTAGE,
+    icon="mdi:chart-timeline-variant",
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ):
     """Set up Phönix Bad sensors from a config entry."""
     _LOGGER.debug("Setting up Phönix Bad sensors...")
-    coordinator: PhoenixBadCoordinator = hass.data[DOMAIN][entry.entry_id]
+    runtime_data: PhoenixBadRuntimeData = hass.data[DOMAIN][entry.entry_id]
 
-    sensors = [
-        PoolOccupancySensor(coordinator),
-        SaunaOccupancySensor(coordinator),
+    sensors: list[SensorEntity] = [
+        PhoenixBadSensor(runtime_data.coordinators[area.key], area, description)
+        for area in AREAS
+        for description in SENSOR_DESCRIPTIONS
     ]
+    if runtime_data.forecast_store is not None:
+        sensors.extend(
+            PhoenixBadForecastSensor(
+                runtime_data.coordinators[area.key], area, runtime_data.forecast_store
+            )
+            for area in AREAS
+        )
     async_add_entities(sensors)
     _LOGGER.debug("Sensors added successfully.")
 
 
 class PhoenixBadSensor(CoordinatorEntity, SensorEntity):
-    """Base class for Phoenix-Bad sensors."""
+    """Sensor reporting one metric of an area's occupancy."""
 
     _attr_has_entity_name = True
-
-    def __init__(self, coordinator: PhoenixBadCoordinator, sensor_type: str):
+    entity_description: PhoenixBadSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PhoenixBadCoordinator,
+        area: Area,
+        description: SensorEntityDescription,
+    ):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._sensor_type = sensor_type
-        self._attr_unique_id = f"phoenixbad_{sensor_type}_occupancy"
-        self._attr_unit_of_measurement = "%"
-
-    @property
-    def device_info(self):
-        """Return device information."""
-        from .const import MANUFACTURER, MODEL, WEBSITE_URL
-
-        return {
-            "identifiers": {(DOMAIN, self.coordinator.config_entry.entry_id)},
-            "name": "Occupancy Data",
-            "manufacturer": MANUFACTURER,
-            "model": MODEL,
-            "configuration_url": WEBSITE_URL,
-            "entry_type": "service",
-        }
-
-    @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        if not self.coordinator.data or self._sensor_type not in self.coordinator.data:
-            return None
-        return round(self.coordinator.data[self._sensor_type].percentage)
+        self.entity_description = description
+        self._sensor_type = area.key
+        self._attr_unique_id = f"phoenixbad_{area.key}_{description.key}"
+        self._attr_translation_placeholders = {"area": area.name}
+        if description.icon is None:
+            self._attr_icon = area.icon
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, coordinator.config_entry.entry_id)},
+            name=DEVICE_NAME,
+            manufacturer=MANUFACTURER,
+            model=MODEL,
+            configuration_url=WEBSITE_URL,
+            entry_type=DeviceEntryType.SERVICE,
+        )
+        self._update_from_coordinator()
+
+    async def async_added_to_hass(self) -> None:
+        """Pick up data fetched between creation and registration."""
+        await super().async_added_to_hass()
+        self._update_from_coordinator()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Recompute the state once per update before it is written."""
+        self._update_from_coordinator()
+        super()._handle_coordinator_update()
+
+    def _update_from_coordinator(self) -> None:
+        """Compute the state and attributes from the coordinator data.
+
+        State reads, which the frontend and recorder make far more often
+        than the coordinator updates, then only return the stored values.
+        """
+        data = self.coordinator.data
+        if not data or (sample := data.get(self._sensor_type)) is None:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        self._attr_native_value = self.entity_description.value_fn(sample)
+        stale = self._sensor_type in self.coordinator.stale_areas
+        attributes: dict[str, Any] = {"stale": stale}
+        if self.entity_description.attributes_fn is not None:
+            attributes.update(self.entity_description.attributes_fn(sample))
+        # Unchanged fetches do not call listeners, so the fetch time is only
+        # shown while stale, when no fetch can move it
+        if stale:
+            attributes["last_fetched"] = self.coordinator.last_fetched.get(
+                self._sensor_type
+            )
+        self._attr_extra_state_attributes = attributes
+
+
+class PhoenixBadForecastSensor(PhoenixBadSensor):
+    """Expected occupancy of an area one hour ahead."""
+
+    entity_description: SensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: PhoenixBadCoordinator,
+        area: Area,
+        forecast_store: OccupancyForecastStore,
+    ):
+        """Initialize the sensor."""
+        self._forecast_store = forecast_store
+        super().__init__(coordinator, area, FORECAST_DESCRIPTION)
+
+    async def async_added_to_hass(self) -> None:
+        """Also update when the forecast moves to the next time slot."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass,
+                self._handle_slot_change,
+                minute=tuple(range(0, 60, SLOT_MINUTES)),
+                second=0,
+            )
+        )
+
+    @callback
+    def _handle_slot_change(self, now: datetime) -> None:
+        """Write the forecast of the new time slot."""
+        self._update_from_coordinator()
+        self.async_write_ha_state()
 
     @property
-    def extra_state_attributes(self):
-        """Return the state attributes."""
-        if not self.coordinator.data or self._sensor_type not in self.coordinator.data:
-            return {}
-        data = self.coordinator.data[self._sensor_type]
-        return {
-            "free": data.free,
-            "occupied": data.occupied,
+    def available(self) -> bool:
+        """Return True; the forecast does not depend on the last update."""
+        return True
+
+    def _update_from_coordinator(self) -> None:
+        """Compute the forecast for the horizon."""
+        cell = self._forecast_store.forecast.at(
+            self._sensor_type, dt_util.now() + FORECAST_HORIZON
+        )
+        self._attr_native_value = None if cell.mean is None else round(cell.mean)
+        self._attr_extra_state_attributes = {
+            "samples": cell.samples,
+            "p10": cell.p10,
+            "p50": cell.p50,
+            "p90": cell.p90,
         }
-
-
-class PoolOccupancySensor(PhoenixBadSensor):
-    """Representation of the pool occupancy sensor."""
-
-    def __init__(self, coordinator: PhoenixBadCoordinator):
-        super().__init__(coordinator, "pool")
-        self._attr_name = "Pool Occupancy"
-        self._attr_icon = "mdi:pool"
-
-
-class SaunaOccupancySensor(PhoenixBadSensor):
-    """Representation of the sauna occupancy sensor."""
-
-    def __init__(self, coordinator: PhoenixBadCoordinator):
-        super().__init__(coordinator, "sauna")
-        self._attr_name = "Sauna Occupancy"
-        self._attr_icon = "mdi:waves"
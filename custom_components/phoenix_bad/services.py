@@ -0,0 +1,123 @@
+"""Services for Phoenix-Bad."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.util import dt as dt_util
+import voluptuous as vol
+
+from .api import AREAS_BY_KEY
+from .backfill import DEFAULT_BACKFILL_DAYS, MAX_BACKFILL_DAYS, async_backfill_area
+from .const import ATTR_AREA, DOMAIN
+from .coordinator import PhoenixBadRuntimeData
+from .scheduler import WEEKDAYS
+from .storage import OccupancyForecastStore
+
+SERVICE_GET_FORECAST = "get_forecast"
+SERVICE_BACKFILL_HISTORY = "backfill_history"
+ATTR_WEEKDAY = "weekday"
+ATTR_TIME = "time"
+ATTR_DAYS = "days"
+
+GET_FORECAST_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_AREA): vol.In(list(AREAS_BY_KEY)),
+        vol.Optional(ATTR_WEEKDAY): vol.In(WEEKDAYS),
+        vol.Optional(ATTR_TIME): cv.time,
+    }
+)
+
+BACKFILL_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_AREA): vol.In(list(AREAS_BY_KEY)),
+        vol.Optional(ATTR_DAYS, default=DEFAULT_BACKFILL_DAYS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_BACKFILL_DAYS)
+        ),
+    }
+)
+
+
+def _runtime_data(hass: HomeAssistant) -> PhoenixBadRuntimeData:
+    """Return the runtime data of the loaded config entry."""
+    for runtime_data in hass.data.get(DOMAIN, {}).values():
+        return runtime_data
+    raise ServiceValidationError(
+        translation_domain=DOMAIN, translation_key="not_loaded"
+    )
+
+
+def _forecast_store(hass: HomeAssistant) -> OccupancyForecastStore:
+    """Return the forecast store of the loaded config entry."""
+    if (forecast_store := _runtime_data(hass).forecast_store) is None:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="not_loaded"
+        )
+    return forecast_store
+
+
+def _requested_time(call: ServiceCall) -> datetime:
+    """Return the next local time matching the requested weekday and time."""
+    now = dt_util.now()
+    day = now.date()
+    if (weekday := call.data.get(ATTR_WEEKDAY)) is not None:
+        day += timedelta(days=(WEEKDAYS.index(weekday) - now.weekday()) % 7)
+    return datetime.combine(day, call.data.get(ATTR_TIME, now.time()), now.tzinfo)
+
+
+async def _async_get_forecast(call: ServiceCall) -> ServiceResponse:
+    """Return the forecast of one or all areas for a weekday and time."""
+    forecast = _forecast_store(call.hass).forecast
+    when = _requested_time(call)
+    areas = [call.data[ATTR_AREA]] if ATTR_AREA in call.data else list(AREAS_BY_KEY)
+
+    return {
+        ATTR_WEEKDAY: WEEKDAYS[when.weekday()],
+        ATTR_TIME: when.strftime("%H:%M"),
+        "areas": {area: forecast.at(area, when)._asdict() for area in areas},
+    }
+
+
+async def _async_backfill_history(call: ServiceCall) -> ServiceResponse:
+    """Backfill history and forecast from the recorder."""
+    hass = call.hass
+    runtime_data = _runtime_data(hass)
+    if "recorder" not in hass.config.components:
+        raise ServiceValidationError(
+            translation_domain=DOMAIN, translation_key="recorder_not_loaded"
+        )
+
+    areas = [call.data[ATTR_AREA]] if ATTR_AREA in call.data else list(AREAS_BY_KEY)
+    results = {}
+    for key in areas:
+        result = await async_backfill_area(
+            hass, runtime_data, AREAS_BY_KEY[key], call.data[ATTR_DAYS]
+        )
+        results[key] = result.as_dict()
+    return results if call.return_response else None
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Phoenix-Bad services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_FORECAST,
+        _async_get_forecast,
+        schema=GET_FORECAST_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BACKFILL_HISTORY,
+        _async_backfill_history,
+        schema=BACKFILL_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,300 @@
+"""Persistence of the last known occupancy for Phoenix-Bad."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+import logging
+import math
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.storage import STORAGE_DIR, Store
+from homeassistant.util import dt as dt_util
+
+from .api import Area, OccupancyData
+from .const import DOMAIN
+from .forecast import OccupancyForecast
+from .history import HistoryRecord, OccupancyHistory
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+# Coalesce bursts of changes into one write
+SAVE_DELAY = 10
+
+# The forecast changes with every poll; persisting it lazily is enough
+FORECAST_SAVE_DELAY = 600
+
+# History samples are buffered in memory and written in batches
+HISTORY_FLUSH_INTERVAL = timedelta(minutes=15)
+# Bound for buffered samples per area if writes keep failing
+HISTORY_MAX_PENDING = 512
+
+# Area key -> (last good sample, time it was fetched)
+OccupancySnapshot = dict[str, tuple[OccupancyData, datetime]]
+
+
+def snapshot_to_dict(snapshot: OccupancySnapshot) -> dict[str, Any]:
+    """Serialize a snapshot for storage."""
+    return {
+        "areas": {
+            area: {
+                "free": data.free,
+                "occupied": data.occupied,
+                "percentage": data.percentage,
+                "fetched_at": fetched_at.isoformat(),
+            }
+            for area, (data, fetched_at) in snapshot.items()
+        }
+    }
+
+
+def snapshot_from_dict(stored: dict[str, Any]) -> OccupancySnapshot:
+    """Deserialize a stored snapshot, skipping malformed areas."""
+    snapshot: OccupancySnapshot = {}
+    for area, values in stored.get("areas", {}).items():
+        try:
+            data = OccupancyData(
+                free=int(values["free"]),
+                occupied=int(values["occupied"]),
+                percentage=float(values["percentage"]),
+            )
+            fetched_at = dt_util.parse_datetime(values["fetched_at"])
+        except (KeyError, TypeError, ValueError):
+            _LOGGER.debug("Ignoring malformed stored occupancy for %s", area)
+            continue
+        if fetched_at is not None:
+            snapshot[area] = (data, fetched_at)
+    return snapshot
+
+
+class OccupancySnapshotStore:
+    """Stores the last good OccupancyData per area of a config entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry the snapshot belongs to
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.occupancy"
+        )
+        self._snapshot: OccupancySnapshot = {}
+
+    async def async_load(self) -> OccupancySnapshot:
+        """Load the stored snapshot."""
+        if (stored := await self._store.async_load()) is None:
+            return {}
+        self._snapshot = snapshot_from_dict(stored)
+        return dict(self._snapshot)
+
+    def async_save_if_changed(
+        self, snapshot: OccupancySnapshot, stale_grace: timedelta
+    ) -> None:
+        """Schedule a write if any area's occupancy or fetch time moved on.
+
+        Unchanged occupancy is written again once its fetch time has moved
+        half the stale grace past the stored one, so that after a restart
+        it is not discarded as too old while it was still being confirmed.
+        Areas missing from the snapshot keep their stored values, so every
+        per-area coordinator can save just its own areas.
+
+        Args:
+            snapshot: Latest good sample and fetch time per area
+            stale_grace: How long the coordinators serve data after its fetch
+        """
+        refresh_after = stale_grace / 2
+        changed = {
+            area: (data, fetched_at)
+            for area, (data, fetched_at) in snapshot.items()
+            if (saved := self._snapshot.get(area)) is None
+            or saved[0] != data
+            or fetched_at - saved[1] >= refresh_after
+        }
+        if not changed:
+            return
+
+        self._snapshot.update(changed)
+        self._store.async_delay_save(
+            lambda: snapshot_to_dict(self._snapshot), SAVE_DELAY
+        )
+
+    async def async_remove(self) -> None:
+        """Delete the stored snapshot."""
+        await self._store.async_remove()
+
+
+class OccupancyHistoryWriter:
+    """Batches occupancy samples into one history ring buffer per area."""
+
+    def __init__(
+        self, hass: HomeAssistant, entry_id: str, areas: Iterable[Area]
+    ) -> None:
+        """Initialize the writer.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry the history belongs to
+            areas: Areas to keep history for
+        """
+        self._hass = hass
+        self.histories = {
+            area.key: OccupancyHistory(
+                Path(
+                    hass.config.path(
+                        STORAGE_DIR, f"{DOMAIN}.{entry_id}.{area.key}.history"
+                    )
+                )
+            )
+            for area in areas
+        }
+        self._pending: dict[str, deque[HistoryRecord]] = {
+            key: deque(maxlen=HISTORY_MAX_PENDING) for key in self.histories
+        }
+        self._lock = asyncio.Lock()
+
+    def add(self, area: str, data: OccupancyData, fetched_at: datetime) -> None:
+        """Buffer a sample until the next flush.
+
+        Args:
+            area: Area key
+            data: Fetched occupancy
+            fetched_at: Time the sample was fetched
+        """
+        if (pending := self._pending.get(area)) is not None:
+            pending.append(HistoryRecord(fetched_at.timestamp(), *data.as_tuple()))
+
+    def async_start(self) -> CALLBACK_TYPE:
+        """Flush periodically; returns a callback that stops flushing."""
+
+        async def _flush(now: datetime) -> None:
+            await self.async_flush()
+
+        return async_track_time_interval(self._hass, _flush, HISTORY_FLUSH_INTERVAL)
+
+    async def async_flush(self) -> None:
+        """Write all buffered samples in the executor."""
+        async with self._lock:
+            batches = {
+                area: list(pending)
+                for area, pending in self._pending.items()
+                if pending
+            }
+            if not batches:
+                return
+            for area in batches:
+                self._pending[area].clear()
+            try:
+                await self._hass.async_add_executor_job(self._write, batches)
+            except OSError as err:
+                _LOGGER.warning("Failed to write occupancy history: %s", err)
+
+    def _write(self, batches: dict[str, list[HistoryRecord]]) -> None:
+        """Append batches to their history files."""
+        for area, records in batches.items():
+            self.histories[area].append(records)
+
+    async def async_oldest_timestamp(self, area: str) -> float | None:
+        """Return the timestamp of the oldest stored record of an area."""
+        return await self._hass.async_add_executor_job(
+            self.histories[area].oldest_timestamp
+        )
+
+    async def async_backfill(self, area: str, records: list[HistoryRecord]) -> int:
+        """Insert records older than the stored history of an area.
+
+        Returns:
+            Number of records inserted
+        """
+        async with self._lock:
+            return await self._hass.async_add_executor_job(
+                self.histories[area].backfill, records
+            )
+
+    async def async_remove(self) -> None:
+        """Delete all history files."""
+        for history in self.histories.values():
+            await self._hass.async_add_executor_job(history.remove)
+
+
+class OccupancyForecastStore:
+    """Keeps the occupancy forecast of a config entry and persists it."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store.
+
+        Args:
+            hass: Home Assistant instance
+            entry_id: Config entry the forecast belongs to
+        """
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.forecast"
+        )
+        self.forecast = OccupancyForecast()
+        # Unix timestamp per area since which every sample has been folded
+        # into the forecast; backfills only fold samples older than that
+        self.covered_since: dict[str, float] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored forecast."""
+        if (stored := await self._store.async_load()) is not None:
+            self.forecast = OccupancyForecast.from_dict(stored.get("areas", {}))
+            self.covered_since = {
+                area: float(timestamp)
+                for area, timestamp in stored.get("covered_since", {}).items()
+            }
+
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the forecast and its coverage for storage."""
+        return {"areas": self.forecast.as_dict(), "covered_since": self.covered_since}
+
+    def record(self, area: str, data: OccupancyData, fetched_at: datetime) -> None:
+        """Fold a fetched sample into the forecast and schedule a save.
+
+        Args:
+            area: Area key
+            data: Fetched occupancy
+            fetched_at: Time the sample was fetched
+        """
+        self.covered_since.setdefault(area, fetched_at.timestamp())
+        if self.forecast.add(area, dt_util.as_local(fetched_at), data):
+            self._store.async_delay_save(self._data_to_save, FORECAST_SAVE_DELAY)
+
+    def record_percentages(
+        self, area: str, samples: Iterable[HistoryRecord], start: float
+    ) -> int:
+        """Fold backfilled samples of an open area into the forecast.
+
+        Samples the forecast already covers are skipped; afterwards it
+        covers everything since start.
+
+        Args:
+            area: Area key
+            samples: Records whose timestamp and percentage are used, read
+                from start up to at least the time already covered
+            start: Unix timestamp the samples were read from
+
+        Returns:
+            Number of samples folded
+        """
+        covered = self.covered_since.get(area, math.inf)
+        folded = 0
+        for sample in samples:
+            if sample.timestamp < covered:
+                when = dt_util.as_local(dt_util.utc_from_timestamp(sample.timestamp))
+                self.forecast.add_percentage(area, when, sample.percentage)
+                folded += 1
+        self.covered_since[area] = min(covered, start)
+        self._store.async_delay_save(self._data_to_save, FORECAST_SAVE_DELAY)
+        return folded
+
+    async def async_remove(self) -> None:
+        """Delete the stored forecast."""
+        await self._store.async_remove()
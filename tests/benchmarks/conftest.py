@@ -0,0 +1,34 @@
+"""Opt-in handling of the benchmark timing gates.
+
+Wall-clock and allocation gates are only meaningful on an idle machine
+without a tracer, so they are skipped unless PHOENIXBAD_BENCHMARKS=1 is set,
+and always under coverage or a debugger.
+"""
+
+import os
+import sys
+
+import pytest
+
+BENCHMARKS_ENV = "PHOENIXBAD_BENCHMARKS"
+
+
+def pytest_configure(config):
+    """Register the timing marker."""
+    config.addinivalue_line(
+        "markers", f"timing: wall-clock or allocation gate, run with {BENCHMARKS_ENV}=1"
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip timing gates unless they were asked for and nothing traces."""
+    if os.environ.get(BENCHMARKS_ENV) != "1":
+        reason = f"timing gates only run with {BENCHMARKS_ENV}=1"
+    elif sys.gettrace() is not None or "coverage" in sys.modules:
+        reason = "timing gates do not run under coverage or a tracer"
+    else:
+        return
+    skip = pytest.mark.skip(reason=reason)
+    for item in items:
+        if "timing" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,193 @@
+"""End-to-end load benchmark against the local stand-in admin-ajax server.
+
+Drives PhoenixBadApiClient (and optionally PhoenixBadCoordinator) with many
+concurrent callers and reports throughput, tail latency and failures, e.g.::
+
+    python -m tests.benchmarks.e2e_bench --concurrency 500 --latency 0.05
+    python -m tests.benchmarks.e2e_bench --error-rate 0.3 --coordinators 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+import logging
+import statistics
+import sys
+import time
+
+from custom_components.phoenix_bad.api import PhoenixBadApiClient
+from tests.stand_in_server import StandInServer, daily_curve
+
+
+@dataclass
+class LoadResult:
+    """Outcome of a load run."""
+
+    calls: int = 0
+    upstream_requests: int = 0
+    duration: float = 0.0
+    latencies_ms: list[float] = field(default_factory=list)
+    failures: Counter[str] = field(default_factory=Counter)
+
+    def summary(self) -> dict[str, float | int | dict[str, int]]:
+        """Return throughput, latency percentiles and failure counts."""
+        percentiles = (
+            statistics.quantiles(self.latencies_ms, n=100)
+            if len(self.latencies_ms) > 1
+            else [0.0] * 99
+        )
+        return {
+            "calls": self.calls,
+            "calls_per_second": round(self.calls / self.duration, 1),
+            "upstream_requests": self.upstream_requests,
+            "p50_ms": round(percentiles[49], 2),
+            "p95_ms": round(percentiles[94], 2),
+            "p99_ms": round(percentiles[98], 2),
+            "max_ms": round(max(self.latencies_ms, default=0.0), 2),
+            "failures": dict(self.failures),
+        }
+
+
+async def _drive(
+    call: Callable[[], Awaitable[object]],
+    concurrency: int,
+    duration: float,
+    result: LoadResult,
+) -> None:
+    """Run concurrent workers that repeat call until the duration is over."""
+    deadline = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await call()
+            except Exception as err:  # noqa: BLE001 - failures are the measurement
+                result.failures[type(err).__name__] += 1
+            result.latencies_ms.append((time.perf_counter() - started) * 1000)
+            result.calls += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    result.duration = time.perf_counter() - started
+
+
+async def run_client_load(
+    server: StandInServer, concurrency: int, duration: float, **client_kwargs: object
+) -> LoadResult:
+    """Hammer get_all_occupancy with concurrent callers."""
+    result = LoadResult()
+    requests_before = server.requests
+    async with PhoenixBadApiClient(api_url=server.api_url, **client_kwargs) as client:
+        await _drive(client.get_all_occupancy, concurrency, duration, result)
+    result.upstream_requests = server.requests - requests_before
+    return result
+
+
+async def run_coordinator_load(
+    server: StandInServer,
+    coordinators: int,
+    concurrency: int,
+    duration: float,
+    **client_kwargs: object,
+) -> LoadResult:
+    """Refresh several coordinators sharing one client concurrently."""
+    # Imported here so the client benchmark runs without the HA test harness
+    from pytest_homeassistant_custom_component.common import (
+        async_test_home_assistant,
+    )
+
+    from custom_components.phoenix_bad.coordinator import PhoenixBadCoordinator
+
+    result = LoadResult()
+    requests_before = server.requests
+    async with (
+        async_test_home_assistant() as hass,
+        PhoenixBadApiClient(api_url=server.api_url, **client_kwargs) as client,
+    ):
+        instances = [
+            PhoenixBadCoordinator(hass, client._session, api=client)
+            for _ in range(coordinators)
+        ]
+
+        async def refresh_all() -> None:
+            await asyncio.gather(*(c.async_refresh() for c in instances))
+            if failed := sum(not c.last_update_success for c in instances):
+                raise RuntimeError(f"{failed} coordinators failed to update")
+
+        await _drive(refresh_all, concurrency, duration, result)
+        await hass.async_stop(force=True)
+    result.upstream_requests = server.requests - requests_before
+    return result
+
+
+async def _main(args: argparse.Namespace) -> None:
+    """Start the stand-in server and run the selected load."""
+    server = StandInServer(
+        {
+            "Bad": daily_curve(300, period=args.duration),
+            "Sauna": daily_curve(60, period=args.duration / 2),
+        },
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        drip_delay=args.drip_delay,
+        conditional=not args.no_conditional,
+    )
+    # The politeness limit is meant for the real website, not the stand-in
+    rate_limit = args.rate_limit or None
+    async with server:
+        if args.coordinators:
+            result = await run_coordinator_load(
+                server,
+                args.coordinators,
+                args.concurrency,
+                args.duration,
+                rate_limit=rate_limit,
+            )
+        else:
+            result = await run_client_load(
+                server, args.concurrency, args.duration, rate_limit=rate_limit
+            )
+
+    for key, value in result.summary().items():
+        print(f"{key:>18}: {value}")
+    print(f"{'server_304s':>18}: {server.not_modified}")
+    print(f"{'server_errors':>18}: {server.errors}")
+
+
+def main() -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drip-delay", type=float, default=0.0)
+    parser.add_argument("--no-conditional", action="store_true")
+    parser.add_argument(
+        "--rate-limit",
+        type=float,
+        default=0.0,
+        help="requests per second allowed to the server; 0 disables the limit",
+    )
+    parser.add_argument(
+        "--coordinators",
+        type=int,
+        default=0,
+        help="drive this many PhoenixBadCoordinators instead of the bare client",
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+    asyncio.run(_main(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,270 @@
+"""Microbenchmark for PhoenixBadApiClient._parse_response over a response corpus.
+
+Run ``python -m tests.benchmarks.parser_bench`` from the repository root to
+print a report, or add ``--update-baseline`` to record a new baseline after
+an intentional parser change. The pytest gate against the baseline only runs
+with ``PHOENIXBAD_BENCHMARKS=1`` and without coverage.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+import json
+import logging
+from pathlib import Path
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any
+
+from custom_components.phoenix_bad.api import (
+    OccupancyData,
+    PhoenixBadApiClient,
+    PhoenixBadParseError,
+)
+
+CORPUS_DIR = Path(__file__).resolve().parent.parent / "corpus"
+BASELINE_FILE = Path(__file__).resolve().parent / "parser_baseline.json"
+
+# Allowed slowdown / allocation growth relative to the baseline
+DEFAULT_TIME_THRESHOLD = 2.0
+DEFAULT_ALLOC_THRESHOLD = 1.25
+
+MIN_SAMPLES = 20
+MAX_SAMPLES = 2000
+TIME_BUDGET = 0.5
+
+
+@dataclass(frozen=True)
+class CorpusCase:
+    """A recorded response body and the data it should parse to."""
+
+    name: str
+    area: str
+    html: str
+    expected: OccupancyData | None
+
+
+@dataclass(frozen=True)
+class CaseResult:
+    """Benchmark result for one corpus case.
+
+    Times are in microseconds per call; relative_p50 is the median divided
+    by the median of a fixed calibration workload, which makes results
+    comparable across machines.
+    """
+
+    samples: int
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    relative_p50: float
+    peak_alloc_bytes: int
+
+
+def load_corpus(corpus_dir: Path = CORPUS_DIR) -> list[CorpusCase]:
+    """Load the response corpus described by corpus.json."""
+    manifest = json.loads((corpus_dir / "corpus.json").read_text(encoding="utf-8"))
+    cases = []
+    for entry in manifest["cases"]:
+        html = (corpus_dir / entry["file"]).read_text(encoding="utf-8")
+        expected = entry["expected"]
+        cases.append(
+            CorpusCase(
+                name=entry["name"],
+                area=entry["area"],
+                html=html * entry.get("repeat", 1),
+                expected=OccupancyData(**expected) if expected else None,
+            )
+        )
+    return cases
+
+
+@contextmanager
+def _quiet_logging() -> Iterator[None]:
+    """Silence integration logging while measuring."""
+    logger = logging.getLogger("custom_components.phoenix_bad")
+    level = logger.level
+    logger.setLevel(logging.CRITICAL + 1)
+    try:
+        yield
+    finally:
+        logger.setLevel(level)
+
+
+def _parse(client: PhoenixBadApiClient, case: CorpusCase) -> OccupancyData | None:
+    """Parse a case, returning None for bodies without occupancy data."""
+    try:
+        return client._parse_response(case.html, case.area)
+    except PhoenixBadParseError:
+        return None
+
+
+def _time_calls(func: Any, *args: Any) -> list[float]:
+    """Return per-call durations in microseconds within the time budget."""
+    durations: list[float] = []
+    deadline = time.perf_counter() + TIME_BUDGET
+    while len(durations) < MAX_SAMPLES and (
+        len(durations) < MIN_SAMPLES or time.perf_counter() < deadline
+    ):
+        start = time.perf_counter_ns()
+        func(*args)
+        durations.append((time.perf_counter_ns() - start) / 1000)
+    return durations
+
+
+def _calibration_workload() -> None:
+    """Fixed pure-Python workload used to normalize timings."""
+    "".join(str(index) for index in range(200)).count("1")
+
+
+def calibrate() -> float:
+    """Return the median duration of the calibration workload in microseconds."""
+    return statistics.median(_time_calls(_calibration_workload))
+
+
+def _peak_allocation(client: PhoenixBadApiClient, case: CorpusCase) -> int:
+    """Return the peak memory allocated by a single parse in bytes."""
+    tracemalloc.start()
+    try:
+        _parse(client, case)
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        _parse(client, case)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak - baseline
+
+
+def run_case(
+    client: PhoenixBadApiClient, case: CorpusCase, calibration_us: float
+) -> CaseResult:
+    """Benchmark a single corpus case."""
+    durations = _time_calls(_parse, client, case)
+    percentiles = statistics.quantiles(durations, n=100)
+    p50 = statistics.median(durations)
+    return CaseResult(
+        samples=len(durations),
+        p50_us=round(p50, 2),
+        p95_us=round(percentiles[94], 2),
+        p99_us=round(percentiles[98], 2),
+        relative_p50=round(p50 / calibration_us, 3),
+        peak_alloc_bytes=_peak_allocation(client, case),
+    )
+
+
+def run_suite(cases: list[CorpusCase] | None = None) -> dict[str, CaseResult]:
+    """Benchmark every corpus case with the default parser configuration."""
+    client = PhoenixBadApiClient()
+    with _quiet_logging():
+        calibration_us = calibrate()
+        return {
+            case.name: run_case(client, case, calibration_us)
+            for case in cases or load_corpus()
+        }
+
+
+def verify_corpus(cases: list[CorpusCase] | None = None) -> list[str]:
+    """Return the names of cases whose parse result differs from the corpus."""
+    client = PhoenixBadApiClient()
+    with _quiet_logging():
+        return [
+            case.name
+            for case in cases or load_corpus()
+            if _parse(client, case) != case.expected
+        ]
+
+
+def load_baseline(path: Path = BASELINE_FILE) -> dict[str, dict[str, Any]]:
+    """Load the stored baseline results."""
+    return json.loads(path.read_text(encoding="utf-8"))["cases"]
+
+
+def save_baseline(results: dict[str, CaseResult], path: Path = BASELINE_FILE) -> None:
+    """Store results as the new baseline."""
+    data = {"cases": {name: asdict(result) for name, result in results.items()}}
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n", "utf-8")
+
+
+def find_regressions(
+    results: dict[str, CaseResult],
+    baseline: dict[str, dict[str, Any]],
+    time_threshold: float = DEFAULT_TIME_THRESHOLD,
+    alloc_threshold: float = DEFAULT_ALLOC_THRESHOLD,
+) -> list[str]:
+    """Compare results with the baseline and describe every regression."""
+    regressions = []
+    for name, result in results.items():
+        if (reference := baseline.get(name)) is None:
+            continue
+
+        limit = reference["relative_p50"] * time_threshold
+        if result.relative_p50 > limit:
+            regressions.append(
+                f"{name}: relative p50 {result.relative_p50} exceeds {limit:.3f}"
+            )
+
+        # Allow a little slack for interpreter-level allocator noise
+        limit = max(reference["peak_alloc_bytes"] * alloc_threshold, 1024)
+        if result.peak_alloc_bytes > limit:
+            regressions.append(
+                f"{name}: peak allocation {result.peak_alloc_bytes} B "
+                f"exceeds {limit:.0f} B"
+            )
+    return regressions
+
+
+def _format_report(results: dict[str, CaseResult]) -> str:
+    """Return a plain-text table of benchmark results."""
+    header = (
+        f"{'case':<18}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}"
+        f"{'rel p50':>10}{'peak B':>10}"
+    )
+    lines = [header]
+    for name, result in results.items():
+        lines.append(
+            f"{name:<18}{result.p50_us:>10}{result.p95_us:>10}{result.p99_us:>10}"
+            f"{result.relative_p50:>10}{result.peak_alloc_bytes:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="store results as baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_TIME_THRESHOLD,
+        help="allowed slowdown factor against the baseline",
+    )
+    args = parser.parse_args()
+
+    if mismatches := verify_corpus():
+        print(f"Corpus cases parsed incorrectly: {', '.join(mismatches)}")
+        return 1
+
+    results = run_suite()
+    print(_format_report(results))
+
+    if args.update_baseline:
+        save_baseline(results)
+        print(f"Baseline written to {BASELINE_FILE}")
+        return 0
+
+    regressions = find_regressions(results, load_baseline(), args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""Microbenchmark for reading Phoenix-Bad sensor state between updates.
+
+Sensors compute their state, attributes and device info once per
+coordinator update. This compares reading those memoized values with a
+verbatim copy of the properties the occupancy sensors had before, which
+recomputed them on every read, for many entities and several frontend/recorder reads per
+update::
+
+    python -m tests.benchmarks.sensor_bench --entities 200 --reads 20
+
+The pytest speedup gate only runs with ``PHOENIXBAD_BENCHMARKS=1`` and
+without coverage.
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Callable
+from datetime import timedelta
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.phoenix_bad.api import AREAS, OccupancyData
+from custom_components.phoenix_bad.const import DOMAIN
+from custom_components.phoenix_bad.sensor import SENSOR_DESCRIPTIONS, PhoenixBadSensor
+
+ROUNDS = 7
+OCCUPANCY = next(desc for desc in SENSOR_DESCRIPTIONS if desc.key == "occupancy")
+
+
+def _fake_coordinator() -> SimpleNamespace:
+    """Return just enough of a coordinator for the sensors to read."""
+    fetched_at = dt_util.utcnow() - timedelta(minutes=3)
+    return SimpleNamespace(
+        data={area.key: OccupancyData(120, 80, 40.0) for area in AREAS},
+        last_fetched={area.key: fetched_at for area in AREAS},
+        stale_areas=set(),
+        config_entry=SimpleNamespace(entry_id="benchmark"),
+    )
+
+
+class RecomputingSensor(PhoenixBadSensor):
+    """Sensor with the properties as they were before memoizing."""
+
+    @property
+    def device_info(self):
+        """Return device information."""
+        from custom_components.phoenix_bad.const import (
+            MANUFACTURER,
+            MODEL,
+            WEBSITE_URL,
+        )
+
+        return {
+            "identifiers": {(DOMAIN, self.coordinator.config_entry.entry_id)},
+            "name": "Occupancy Data",
+            "manufacturer": MANUFACTURER,
+            "model": MODEL,
+            "configuration_url": WEBSITE_URL,
+            "entry_type": "service",
+        }
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        if not self.coordinator.data or self._sensor_type not in self.coordinator.data:
+            return None
+        return round(self.coordinator.data[self._sensor_type].percentage)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes."""
+        if not self.coordinator.data or self._sensor_type not in self.coordinator.data:
+            return {}
+        data = self.coordinator.data[self._sensor_type]
+        return {
+            "free": data.free,
+            "occupied": data.occupied,
+        }
+
+
+def build_sensors(
+    entities: int, sensor_class: type[PhoenixBadSensor] = PhoenixBadSensor
+) -> list[PhoenixBadSensor]:
+    """Create occupancy sensors cycling through every area.
+
+    Only the occupancy sensors existed before memoizing, so both sides of the
+    comparison are limited to them.
+    """
+    coordinator = _fake_coordinator()
+    return [
+        sensor_class(coordinator, AREAS[index % len(AREAS)], OCCUPANCY)
+        for index in range(entities)
+    ]
+
+
+def _read(sensor: PhoenixBadSensor) -> None:
+    """Read everything a state write and the frontend look at."""
+    sensor.native_value  # noqa: B018
+    sensor.extra_state_attributes  # noqa: B018
+    sensor.device_info  # noqa: B018
+
+
+def memoized_cycle(sensors: list[PhoenixBadSensor], reads: int) -> None:
+    """One coordinator update followed by repeated reads of stored values."""
+    for sensor in sensors:
+        sensor._update_from_coordinator()
+    for _ in range(reads):
+        for sensor in sensors:
+            _read(sensor)
+
+
+def recomputed_cycle(sensors: list[PhoenixBadSensor], reads: int) -> None:
+    """Repeated reads of sensors that recompute everything on every read."""
+    for _ in range(reads):
+        for sensor in sensors:
+            _read(sensor)
+
+
+def _time_cycle(
+    cycle: Callable[[list[PhoenixBadSensor], int], None],
+    sensors: list[PhoenixBadSensor],
+    reads: int,
+) -> float:
+    """Return the median nanoseconds per entity read of a cycle."""
+    durations = []
+    for _ in range(ROUNDS):
+        started = time.perf_counter_ns()
+        cycle(sensors, reads)
+        durations.append(time.perf_counter_ns() - started)
+    return statistics.median(durations) / (len(sensors) * reads)
+
+
+def run(entities: int, reads: int) -> dict[str, float]:
+    """Benchmark both strategies and return ns per entity read."""
+    memoized = _time_cycle(memoized_cycle, build_sensors(entities), reads)
+    recomputed = _time_cycle(
+        recomputed_cycle, build_sensors(entities, RecomputingSensor), reads
+    )
+    return {
+        "memoized_ns": round(memoized),
+        "recomputed_ns": round(recomputed),
+        "speedup": round(recomputed / memoized, 2),
+    }
+
+
+def main() -> int:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--reads", type=int, nargs="+", default=[1, 5, 20])
+    args = parser.parse_args()
+
+    print(f"{'entities':>10}{'reads':>8}{'memo ns':>10}{'recomp ns':>11}{'x':>7}")
+    for entities in args.entities:
+        for reads in args.reads:
+            result = run(entities, reads)
+            print(
+                f"{entities:>10}{reads:>8}{result['memoized_ns']:>10}"
+                f"{result['recomputed_ns']:>11}{result['speedup']:>7}"
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
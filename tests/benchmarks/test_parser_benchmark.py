@@ -0,0 +1,28 @@
+"""Regression gate for the parser microbenchmark."""
+
+import pytest
+
+from tests.benchmarks.parser_bench import (
+    find_regressions,
+    load_baseline,
+    load_corpus,
+    run_suite,
+    verify_corpus,
+)
+
+
+def test_corpus_parses_to_expected_data():
+    """Test that every recorded response parses to its expected data."""
+    assert verify_corpus() == []
+
+
+def test_baseline_covers_corpus():
+    """Test that the stored baseline has an entry for every corpus case."""
+    assert {case.name for case in load_corpus()} <= set(load_baseline())
+
+
+@pytest.mark.timing
+def test_parser_performance_has_not_regressed():
+    """Test parser latency and allocations against the stored baseline."""
+    regressions = find_regressions(run_suite(), load_baseline())
+    assert not regressions, "\n".join(regressions)
@@ -0,0 +1,34 @@
+"""Regression gate for the sensor read microbenchmark."""
+
+import pytest
+
+from tests.benchmarks.sensor_bench import RecomputingSensor, build_sensors, run
+
+
+def test_sensors_serve_values_computed_on_update():
+    """Test that reads return the values computed for the last update."""
+    sensor = build_sensors(1)[0]
+
+    assert sensor.native_value == 40
+    assert sensor.extra_state_attributes == {
+        "stale": False,
+        "free": 120,
+        "occupied": 80,
+    }
+    assert sensor.device_info is sensor.device_info
+
+
+def test_recomputing_copy_matches_the_sensor():
+    """Test that the pre-memoization baseline reports the same state."""
+    sensor = build_sensors(1)[0]
+    baseline = build_sensors(1, RecomputingSensor)[0]
+
+    assert baseline.native_value == sensor.native_value
+    assert baseline.extra_state_attributes == {"free": 120, "occupied": 80}
+    assert baseline.device_info["identifiers"] == sensor.device_info["identifiers"]
+
+
+@pytest.mark.timing
+def test_memoized_reads_are_cheaper_than_recomputing():
+    """Test that serving stored values beats recomputing them per read."""
+    assert run(entities=100, reads=5)["speedup"] > 1
@@ -0,0 +1,56 @@
+"""Shared fixtures for the Phoenix-Bad tests."""
+
+from unittest.mock import patch
+
+import pytest
+import pytest_asyncio
+from custom_components.phoenix_bad import api
+from custom_components.phoenix_bad.api import (
+    AREAS,
+    OccupancyData,
+    PhoenixBadApiClient,
+    PhoenixBadConnectionError,
+)
+from custom_components.phoenix_bad.const import CONF_BLOCKING_FIRST_REFRESH, DOMAIN
+from custom_components.phoenix_bad.resilience import TokenBucket
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+SAMPLES = {
+    "pool": OccupancyData(free=120, occupied=80, percentage=40.0),
+    "sauna": OccupancyData(free=30, occupied=10, percentage=25.0),
+}
+
+
+@pytest.fixture(autouse=True)
+def unthrottled_hosts(monkeypatch):
+    """Give each test its own host buckets that never make requests wait."""
+    monkeypatch.setattr(api, "_HOST_BUCKETS", {})
+    monkeypatch.setattr(
+        api, "host_bucket", lambda host, rate, burst: TokenBucket(1e9, 1e9)
+    )
+
+
+@pytest.fixture
+def occupancy():
+    """Serve settable occupancy instead of fetching it; remove an area to fail it."""
+    samples = dict(SAMPLES)
+
+    async def _get_all_occupancy(self, areas=AREAS):
+        result = {area.key: samples[area.key] for area in areas if area.key in samples}
+        if not result:
+            raise PhoenixBadConnectionError("Failed to fetch data for all areas")
+        return result
+
+    with patch.object(PhoenixBadApiClient, "get_all_occupancy", _get_all_occupancy):
+        yield samples
+
+
+@pytest_asyncio.fixture
+async def integration(hass, enable_custom_integrations, occupancy):
+    """Set up a config entry that fetched occupancy before adding entities."""
+    entry = MockConfigEntry(domain=DOMAIN, options={CONF_BLOCKING_FIRST_REFRESH: True})
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    yield entry
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,193 @@
+"""Local stand-in for phoenixbad.de's admin-ajax.php updateLiveVisitors endpoint.
+
+The server renders the same markup as the live endpoint from scriptable
+occupancy curves and can inject latency, jitter, errors, slow-drip bodies
+and ETag based 304 responses, so the client can be exercised offline.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import hashlib
+import math
+import random
+import time
+from typing import Self
+
+from aiohttp import web
+
+ADMIN_AJAX_PATH = "/wp-admin/admin-ajax.php"
+AREA_DATA_MISSING = "Area data missing"
+MAINTENANCE_PAGE = (
+    "<!DOCTYPE html><html><head><title>Wartungsmodus</title></head>"
+    "<body><h1>Wir sind gleich zurück</h1></body></html>"
+)
+
+# Maps seconds since server start to (free, occupied percentage), or None
+# while the area is closed.
+OccupancyCurve = Callable[[float], tuple[int, float] | None]
+
+
+def constant_curve(free: int, percentage: float) -> OccupancyCurve:
+    """Return a curve that always reports the same occupancy."""
+    return lambda elapsed: (free, percentage)
+
+
+def closed_curve() -> OccupancyCurve:
+    """Return a curve for an area that is always closed."""
+    return lambda elapsed: None
+
+
+def daily_curve(
+    capacity: int, period: float = 86400, peak: float = 80.0
+) -> OccupancyCurve:
+    """Return a sine-shaped curve between 0% and peak% over one period.
+
+    Args:
+        capacity: Total number of places
+        period: Length of one cycle in seconds; shorten it to replay a day
+            within a benchmark run
+        peak: Highest occupancy percentage reached
+    """
+
+    def curve(elapsed: float) -> tuple[int, float]:
+        percentage = round(peak * (1 - math.cos(2 * math.pi * elapsed / period)) / 2, 2)
+        return round(capacity * (100 - percentage) / 100), percentage
+
+    return curve
+
+
+def render_occupancy(free: int, percentage: float) -> str:
+    """Render the markup the live endpoint returns for an open area."""
+    return (
+        '<div class="live_visitors">'
+        f'<div class="outer_wrapper" data-free="{free}">'
+        f'<div class="inner_wrapper" style="width: {percentage}%;"></div>'
+        "</div></div>"
+    )
+
+
+class StandInServer:
+    """aiohttp server mimicking admin-ajax.php?action=updateLiveVisitors."""
+
+    def __init__(
+        self,
+        curves: dict[str, OccupancyCurve] | None = None,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        drip_delay: float = 0.0,
+        drip_chunk_size: int = 32,
+        conditional: bool = True,
+        seed: int = 0,
+    ) -> None:
+        """Initialize the server.
+
+        Args:
+            curves: Occupancy curves keyed by area= query value; unknown
+                areas report "Area data missing"
+            latency: Fixed delay before answering, in seconds
+            jitter: Maximum random extra delay, in seconds
+            error_rate: Fraction of requests answered with a 503 page
+            drip_delay: Delay between body chunks; 0 sends the body at once
+            drip_chunk_size: Size of each slow-drip chunk in bytes
+            conditional: Send ETags and answer If-None-Match with 304
+            seed: Seed for jitter and error injection
+        """
+        self.curves = curves or {
+            "Bad": constant_curve(183, 38.59),
+            "Sauna": constant_curve(41, 31.67),
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.drip_delay = drip_delay
+        self.drip_chunk_size = drip_chunk_size
+        self.conditional = conditional
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self._random = random.Random(seed)
+        self._started = time.monotonic()
+        self._runner: web.AppRunner | None = None
+        self.api_url = ""
+
+    async def start(self) -> str:
+        """Start listening on a free local port and return the admin-ajax URL."""
+        app = web.Application()
+        app.router.add_get(ADMIN_AJAX_PATH, self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self._started = time.monotonic()
+        self.api_url = f"http://127.0.0.1:{port}{ADMIN_AJAX_PATH}"
+        return self.api_url
+
+    async def stop(self) -> None:
+        """Stop the server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> Self:
+        """Start the server."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        """Stop the server."""
+        await self.stop()
+
+    def render(self, area: str) -> str:
+        """Render the current body for an area."""
+        if (curve := self.curves.get(area)) is None:
+            return AREA_DATA_MISSING
+        if (values := curve(time.monotonic() - self._started)) is None:
+            return AREA_DATA_MISSING
+        return render_occupancy(*values)
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Answer an updateLiveVisitors request."""
+        self.requests += 1
+        if request.query.get("action") != "updateLiveVisitors":
+            # WordPress answers unknown admin-ajax actions with a bare 0
+            return web.Response(status=400, text="0")
+
+        delay = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.Response(
+                status=503, text=MAINTENANCE_PAGE, content_type="text/html"
+            )
+
+        body = self.render(request.query.get("area", "")).encode()
+        headers = {}
+        if self.conditional:
+            etag = f'"{hashlib.sha1(body).hexdigest()}"'
+            if request.headers.get("If-None-Match") == etag:
+                self.not_modified += 1
+                return web.Response(status=304, headers={"ETag": etag})
+            headers["ETag"] = etag
+
+        if not self.drip_delay:
+            return web.Response(body=body, headers=headers, content_type="text/html")
+
+        response = web.StreamResponse(headers=headers)
+        response.content_type = "text/html"
+        await response.prepare(request)
+        try:
+            for start in range(0, len(body), self.drip_chunk_size):
+                await response.write(body[start : start + self.drip_chunk_size])
+                await asyncio.sleep(self.drip_delay)
+            await response.write_eof()
+        except ConnectionResetError:
+            # Streaming clients hang up once they have seen enough
+            pass
+        return response
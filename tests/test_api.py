@@ -1,7 +1,83 @@
 """Tests for Phoenix-Bad API client."""
 
+import asyncio
+import dataclasses
+from pathlib import Path
+import subprocess
+import sys
+from types import SimpleNamespace
+
 import pytest
-from custom_components.phoenix_bad.api import PhoenixBadApiClient, PhoenixBadParseError
+from custom_components.phoenix_bad.api import (
+    AREAS,
+    POOL_URL,
+    SAUNA_URL,
+    Area,
+    OccupancyData,
+    PhoenixBadApiClient,
+    PhoenixBadCircuitOpenError,
+    PhoenixBadConnectionError,
+    PhoenixBadParseError,
+    host_bucket,
+)
+from custom_components.phoenix_bad.metrics import RequestTrace
+from custom_components.phoenix_bad.resilience import NO_RETRY, RetryPolicy
+
+POOL_HTML = '<div class="outer_wrapper" data-free="10"><div class="inner_wrapper" style="width: 50.0%;"></div></div>'
+
+
+class FakeContent:
+    """Minimal stand-in for an aiohttp stream reader."""
+
+    def __init__(self, body: bytes):
+        self._body = body
+        self.consumed = 0
+
+    async def iter_chunked(self, size):
+        while self.consumed < len(self._body):
+            chunk = self._body[self.consumed : self.consumed + size]
+            self.consumed += len(chunk)
+            yield chunk
+
+
+class FakeResponse:
+    """Minimal stand-in for an aiohttp response."""
+
+    def __init__(self, body: str, status: int = 200, headers=None):
+        self.status = status
+        self.reason = "OK"
+        self.headers = headers or {}
+        self.charset = "utf-8"
+        self._body = body.encode()
+        self.content = FakeContent(self._body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    async def read(self):
+        return self._body
+
+
+async def _no_sleep(delay):
+    return None
+
+
+class FakeSession:
+    """Session that replays queued responses and records request headers."""
+
+    def __init__(self, *responses: FakeResponse, routes=None):
+        self.responses = list(responses)
+        self.routes = routes or {}
+        self.requests: list[dict] = []
+
+    def get(self, url, headers=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        if url in self.routes:
+            return self.routes[url].pop(0)
+        return self.responses.pop(0)
 
 
 def test_parse_response_success():
@@ -54,3 +130,395 @@ def test_parse_response_100_percent():
 
     assert data.percentage == 100.0
     assert data.occupied == 5  # Based on assume total = 2 * free in api.py
+
+
+@pytest.mark.parametrize(
+    "html",
+    [
+        '<div class="outer_wrapper" data-free="10"><div class="inner_wrapper" style="width: 50.0%;"></div></div>',
+        "Area data missing...",
+        '<div data-free="20"><div style="width: 25%;"></div></div>',
+        '<div class="outer_wrapper" data-free="5"><div class="inner_wrapper" style="width: 100%;"></div></div>',
+        '<div class="outer_wrapper" data-free="abc"></div>',
+        # Widths outside the inner wrapper's style are not the occupancy
+        '<div class="outer_wrapper" data-free="10" style="max-width: 100%"><div class="inner_wrapper" style="width: 30%"></div></div>',
+        '<!-- <div data-free="99"> --><div class="outer_wrapper" data-free="10"><div class="inner_wrapper" style="width: 30%"></div></div>',
+        '<div class="outer_wrapper" data-free="1&#48;"><div class="inner_wrapper" style="width: 4&#48;%"></div></div>',
+        # The outer wrapper wins over an earlier data-free element
+        '<div data-free="3"></div><div class="outer_wrapper" data-free="10"><div class="inner_wrapper" style="width: 30%"></div></div>',
+        # Markup inside scripts and styles is text, not tags
+        '<script>var tpl = "<div data-free=\'5\'>";</script><div class="outer_wrapper" data-free="10"><div class="inner_wrapper" style="width: 30%"></div></div>',
+        '<style>.x::before { content: "<div data-free=7>" }</style><div data-free="10"><div style="width: 20%"></div></div>',
+        '<div class="outer_wrapper_old" data-free="3"></div><div class="big outer_wrapper" data-free="10"><div class="inner_wrapper" style="width: 30%"></div></div>',
+    ],
+)
+def test_parser_engines_agree(html):
+    """Test that the fast and soup parser engines return identical data."""
+    fast = PhoenixBadApiClient(parser="fast")._parse_response(html, "Pool")
+    soup = PhoenixBadApiClient(parser="soup")._parse_response(html, "Pool")
+
+    assert (fast.free, fast.occupied, fast.percentage) == (
+        soup.free,
+        soup.occupied,
+        soup.percentage,
+    )
+
+
+def test_parse_fast_falls_back_to_soup():
+    """Test that the soup cascade runs when the fast path finds nothing."""
+    html = '<div class="outer_wrapper"><div class="inner_wrapper"></div></div>'
+    client = PhoenixBadApiClient()
+    with pytest.raises(PhoenixBadParseError, match="data-free attribute"):
+        client._parse_response(html, "Pool")
+
+
+def test_unknown_parser_engine():
+    """Test that an unknown parser engine is rejected."""
+    with pytest.raises(ValueError):
+        PhoenixBadApiClient(parser="lxml")
+
+
+@pytest.mark.asyncio
+async def test_conditional_get_not_modified():
+    """Test that validators are sent and a 304 reuses the previous data."""
+    session = FakeSession(
+        FakeResponse(POOL_HTML, headers={"ETag": '"abc"', "Last-Modified": "x"}),
+        FakeResponse("", status=304),
+    )
+    client = PhoenixBadApiClient(session=session)
+
+    first = await client._fetch_occupancy(POOL_URL, "pool")
+    second = await client._fetch_occupancy(POOL_URL, "pool")
+
+    assert second is first
+    assert "If-None-Match" not in session.requests[0]
+    assert session.requests[1]["If-None-Match"] == '"abc"'
+    assert session.requests[1]["If-Modified-Since"] == "x"
+    assert client.stats["pool"].not_modified == 1
+
+
+@pytest.mark.asyncio
+async def test_fingerprint_skips_parse(monkeypatch):
+    """Test that an identical body is not parsed twice."""
+    session = FakeSession(FakeResponse(POOL_HTML), FakeResponse(POOL_HTML))
+    client = PhoenixBadApiClient(session=session)
+    first = await client._fetch_occupancy(POOL_URL, "pool")
+
+    def fail_parse(*args):
+        raise AssertionError("unchanged body was parsed")
+
+    monkeypatch.setattr(client, "_parse_response", fail_parse)
+    second = await client._fetch_occupancy(POOL_URL, "pool")
+
+    assert second is first
+    assert client.stats["pool"].fingerprint_hits == 1
+    assert client.stats["pool"].requests == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced():
+    """Test that concurrent callers share one upstream request."""
+    session = FakeSession(FakeResponse(POOL_HTML), FakeResponse(POOL_HTML))
+    client = PhoenixBadApiClient(session=session)
+
+    results = await asyncio.gather(*(client.get_pool_occupancy() for _ in range(5)))
+
+    assert len(session.requests) == 1
+    assert all(result is results[0] for result in results)
+    assert client.stats["pool"].coalesced == 4
+
+    # Once the request has finished a new call goes upstream again
+    await client.get_pool_occupancy()
+    assert len(session.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesced_requests_share_exception():
+    """Test that every coalesced caller receives the same exception."""
+    session = FakeSession(FakeResponse("<div>No data here</div>", status=500))
+    client = PhoenixBadApiClient(session=session, retry_policy=NO_RETRY)
+
+    results = await asyncio.gather(
+        *(client.get_pool_occupancy() for _ in range(3)), return_exceptions=True
+    )
+
+    assert len(session.requests) == 1
+    assert all(isinstance(result, PhoenixBadConnectionError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_repeated_reads():
+    """Test that reads within the TTL do not hit the network."""
+    session = FakeSession(FakeResponse(POOL_HTML), FakeResponse(POOL_HTML))
+    client = PhoenixBadApiClient(session=session, cache_ttl=60)
+
+    first = await client.get_pool_occupancy()
+    second = await client.get_pool_occupancy()
+    assert second is first
+    assert len(session.requests) == 1
+    assert client.cache_stats["hits"] == 1
+
+    client.invalidate_cache()
+    await client.get_pool_occupancy()
+    assert len(session.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_stats_and_cache_ttls_use_area_keys():
+    """Test that per-area TTLs, stats and metrics are keyed like the data."""
+    session = FakeSession(FakeResponse(POOL_HTML), FakeResponse(POOL_HTML))
+    client = PhoenixBadApiClient(session=session, cache_ttls={"pool": 60})
+
+    await client.get_pool_occupancy()
+    await client.get_pool_occupancy()
+
+    assert len(session.requests) == 1
+    assert set(client.stats) == {"pool"}
+    assert set(client.metrics.as_dict()) <= {"pool"}
+
+
+@pytest.mark.asyncio
+async def test_backoff_does_not_hold_a_request_slot(monkeypatch):
+    """Test that other areas are fetched while one area waits to retry."""
+    backoff = asyncio.Event()
+
+    async def _blocked_sleep(delay):
+        await backoff.wait()
+
+    monkeypatch.setattr(asyncio, "sleep", _blocked_sleep)
+    session = FakeSession(
+        routes={
+            POOL_URL: [FakeResponse("", status=503), FakeResponse(POOL_HTML)],
+            SAUNA_URL: [FakeResponse(POOL_HTML)],
+        }
+    )
+    client = PhoenixBadApiClient(
+        session=session,
+        max_concurrency=1,
+        retry_policy=RetryPolicy(connection_attempts=2),
+    )
+
+    pool = asyncio.ensure_future(client.get_pool_occupancy())
+    await asyncio.wait_for(client.get_sauna_occupancy(), 1)
+    backoff.set()
+    assert (await pool).free == 10
+
+
+@pytest.mark.asyncio
+async def test_connection_errors_are_retried(monkeypatch):
+    """Test that a failed request is retried with backoff."""
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+    session = FakeSession(
+        FakeResponse("", status=503),
+        FakeResponse(POOL_HTML),
+    )
+    client = PhoenixBadApiClient(
+        session=session, retry_policy=RetryPolicy(connection_attempts=2)
+    )
+
+    data = await client.get_pool_occupancy()
+
+    assert data.free == 10
+    assert client.stats["pool"].retries == 1
+
+
+@pytest.mark.asyncio
+async def test_parse_errors_are_not_retried_by_default(monkeypatch):
+    """Test that parse errors use their own, smaller retry budget."""
+    monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+    session = FakeSession(FakeResponse('<div class="outer_wrapper"></div>'))
+    client = PhoenixBadApiClient(session=session)
+
+    with pytest.raises(PhoenixBadParseError):
+        await client.get_pool_occupancy()
+    assert len(session.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast():
+    """Test that an open circuit rejects requests without network I/O."""
+    session = FakeSession(FakeResponse("", status=503))
+    client = PhoenixBadApiClient(
+        session=session, retry_policy=NO_RETRY, circuit_failure_threshold=1
+    )
+
+    with pytest.raises(PhoenixBadConnectionError):
+        await client.get_pool_occupancy()
+    with pytest.raises(PhoenixBadCircuitOpenError):
+        await client.get_pool_occupancy()
+
+    assert len(session.requests) == 1
+    assert client.stats["pool"].circuit_rejections == 1
+
+
+def test_area_registry_urls():
+    """Test that the registry builds the updateLiveVisitors URLs."""
+    assert POOL_URL.endswith("action=updateLiveVisitors&area=Bad")
+    assert SAUNA_URL.endswith("action=updateLiveVisitors&area=Sauna")
+    assert len({area.key for area in AREAS}) == len(AREAS)
+
+
+@pytest.mark.asyncio
+async def test_get_all_occupancy_partial_results():
+    """Test fan-out over custom areas with one failing area."""
+    kids = Area(key="kids", name="Kids", query="Kinder", icon="mdi:baby")
+    session = FakeSession(
+        routes={
+            POOL_URL: [FakeResponse(POOL_HTML)],
+            kids.url: [FakeResponse("", status=500)],
+        }
+    )
+    client = PhoenixBadApiClient(session=session, retry_policy=NO_RETRY)
+
+    result = await client.get_all_occupancy((AREAS[0], kids))
+
+    assert list(result) == ["pool"]
+    assert result["pool"].free == 10
+
+
+def test_occupancy_data_value_semantics():
+    """Test that OccupancyData is a compact, immutable value type."""
+    data = OccupancyData(free=10, occupied=10, percentage=50.0)
+
+    assert data == OccupancyData(10, 10, 50.0)
+    assert data != OccupancyData(10, 11, 50.0)
+    assert hash(data) == hash(OccupancyData(10, 10, 50.0))
+    assert data.total == 20
+    assert not hasattr(data, "__dict__")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        data.free = 5
+
+    assert data.as_tuple() == (10, 10, 50.0)
+    assert data.to_array().tolist() == [10.0, 10.0, 50.0]
+    assert OccupancyData.from_tuple(data.to_array()) == data
+
+
+def test_occupancy_data_deadbands():
+    """Test per-field deadband comparison of samples."""
+    data = OccupancyData(free=100, occupied=50, percentage=33.33)
+    nearby = OccupancyData(free=99, occupied=51, percentage=34.0)
+    deadbands = {"free": 2, "occupied": 2, "percentage": 1.0}
+
+    assert data.is_close(data, {})
+    assert not data.is_close(nearby, {})
+    assert data.is_close(nearby, deadbands)
+    assert not data.is_close(nearby, {**deadbands, "percentage": 0.5})
+    # Opening or closing always counts as a change
+    closed = OccupancyData(free=0, occupied=0, percentage=0.0)
+    barely_open = OccupancyData(free=1, occupied=0, percentage=0.0)
+    assert not closed.is_close(barely_open, {"free": 5})
+
+
+@pytest.mark.asyncio
+async def test_streaming_read_stops_early():
+    """Test that streaming stops once both occupancy values were read."""
+    response = FakeResponse(POOL_HTML + "<p>padding</p>" * 2000)
+    client = PhoenixBadApiClient(session=FakeSession(response))
+
+    data = await client.get_pool_occupancy()
+
+    assert data.free == 10
+    assert data.percentage == 50.0
+    assert response.content.consumed < len(response._body)
+    assert client.stats["pool"].bytes_read == response.content.consumed
+
+
+@pytest.mark.asyncio
+async def test_streaming_read_is_capped():
+    """Test that huge bodies are cut off at max_body_bytes."""
+    response = FakeResponse("<p>maintenance</p>" * 10000 + POOL_HTML)
+    client = PhoenixBadApiClient(
+        session=FakeSession(response), retry_policy=NO_RETRY, max_body_bytes=8192
+    )
+
+    with pytest.raises(PhoenixBadParseError):
+        await client.get_pool_occupancy()
+
+    assert client.stats["pool"].last_bytes_read == 8192
+    assert client.stats["pool"].truncated == 1
+
+
+@pytest.mark.asyncio
+async def test_owned_session_uses_tuned_connector():
+    """Test that a standalone client creates a tuned connection pool."""
+    async with PhoenixBadApiClient(limit_per_host=2) as client:
+        connector = client._session.connector
+        assert connector.limit_per_host == 2
+        assert connector.use_dns_cache
+
+        trace = RequestTrace()
+        ctx = SimpleNamespace(trace_request_ctx=trace)
+        trace_config = client.trace_config()
+        await trace_config.on_connection_create_start[0](None, ctx, None)
+        await trace_config.on_connection_create_end[0](None, ctx, None)
+        client._record_request("pool", trace, 0.1)
+
+    assert client.connection_stats == {"created": 1, "reused": 0}
+    assert client.metrics.histogram("pool", "connect").count == 1
+
+
+@pytest.mark.asyncio
+async def test_accept_encoding_opt_in():
+    """Test that compressed transfer is only requested when enabled."""
+    session = FakeSession(FakeResponse(POOL_HTML), FakeResponse(POOL_HTML))
+
+    await PhoenixBadApiClient(session=session).get_pool_occupancy()
+    await PhoenixBadApiClient(
+        session=session, accept_compressed=True
+    ).get_pool_occupancy()
+
+    assert session.requests[0]["Accept-Encoding"] == "identity"
+    assert session.requests[1]["Accept-Encoding"] == "gzip, deflate"
+
+
+@pytest.mark.asyncio
+async def test_request_phases_are_recorded():
+    """Test that TTFB, body and parse times are recorded per area."""
+    client = PhoenixBadApiClient(session=FakeSession(FakeResponse(POOL_HTML)))
+
+    await client.get_pool_occupancy()
+
+    for phase in ("ttfb", "body", "parse"):
+        assert client.metrics.histogram("pool", phase).count == 1
+    assert client.metrics.histogram("pool", "dns").count == 0
+
+
+def test_timeout_can_be_changed_at_runtime():
+    """Test that a new timeout applies to subsequent requests."""
+    client = PhoenixBadApiClient(timeout=20)
+    client.timeout = 7
+
+    assert client.timeout == 7
+    assert client._timeout.total == 7
+
+
+def test_beautifulsoup_is_imported_lazily():
+    """Test that importing the API client does not import bs4."""
+    code = (
+        "import sys\n"
+        "import custom_components.phoenix_bad.api\n"
+        "print('bs4' in sys.modules)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+        text=True,
+    )
+
+    assert result.stdout.strip() == "False"
+
+
+def test_host_bucket_is_shared_per_host():
+    """Test that all clients of a host share the first bucket created."""
+    bucket = host_bucket("example.org", 1.0, 4)
+
+    assert host_bucket("example.org", 5.0, 10) is bucket
+    assert bucket.rate == 1.0
+    assert host_bucket("example.net", 1.0, 4) is not bucket
+
+
+def test_rate_limit_can_be_disabled():
+    """Test that no bucket is used without a rate limit."""
+    assert PhoenixBadApiClient(rate_limit=None)._bucket is None
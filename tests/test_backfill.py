@@ -0,0 +1,87 @@
+"""Tests for backfilling Phoenix-Bad history from the recorder."""
+
+from datetime import timedelta
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.phoenix_bad import backfill
+from custom_components.phoenix_bad.api import AREAS, OccupancyData
+from custom_components.phoenix_bad.const import DOMAIN
+from custom_components.phoenix_bad.coordinator import PhoenixBadRuntimeData
+from custom_components.phoenix_bad.history import HistoryRecord, OccupancyHistory
+from custom_components.phoenix_bad.storage import (
+    OccupancyForecastStore,
+    OccupancyHistoryWriter,
+)
+
+POOL = AREAS[0]
+# Ten days of hourly open samples, more than the ring below holds
+RECORDED_HOURS = 240
+RING_CAPACITY = 24
+
+
+@pytest.fixture
+def runtime_data(hass, tmp_path, monkeypatch):
+    """Return runtime data with a small ring and ten days of recorded hours."""
+    er.async_get(hass).async_get_or_create(
+        "sensor", DOMAIN, f"phoenixbad_{POOL.key}_occupancy"
+    )
+    now = dt_util.utcnow().timestamp()
+    recorded = [
+        HistoryRecord(now - hours * 3600, 0, 0, 50.0)
+        for hours in range(RECORDED_HOURS, 0, -1)
+    ]
+
+    async def _read(hass, entity_id, start, end):
+        return [
+            record
+            for record in recorded
+            if start.timestamp() <= record.timestamp < end.timestamp()
+        ]
+
+    monkeypatch.setattr(backfill, "_async_read_records", _read)
+    history = OccupancyHistoryWriter(hass, "test", [POOL])
+    history.histories[POOL.key] = OccupancyHistory(
+        tmp_path / "pool.history", RING_CAPACITY
+    )
+    return PhoenixBadRuntimeData(
+        api=None,
+        coordinators={},
+        history=history,
+        forecast_store=OccupancyForecastStore(hass, "test"),
+    )
+
+
+def _forecast_samples(runtime_data: PhoenixBadRuntimeData) -> int:
+    """Return the number of samples folded into the pool forecast."""
+    return sum(runtime_data.forecast_store.forecast.matrices[POOL.key].counts)
+
+
+@pytest.mark.asyncio
+async def test_backfill_twice_counts_every_hour_once(hass, runtime_data):
+    """Test that a second run neither refolds nor reinserts hours."""
+    first = await backfill.async_backfill_area(hass, runtime_data, POOL, days=30)
+    assert first.rows == RECORDED_HOURS
+    assert first.inserted == RING_CAPACITY
+    assert _forecast_samples(runtime_data) == RECORDED_HOURS
+
+    # The ring kept only the newest hours, so this run reads older ones again
+    second = await backfill.async_backfill_area(hass, runtime_data, POOL, days=30)
+    assert second.rows == RECORDED_HOURS - RING_CAPACITY
+    assert second.inserted == 0
+    assert _forecast_samples(runtime_data) == RECORDED_HOURS
+
+
+@pytest.mark.asyncio
+async def test_backfill_skips_hours_covered_by_live_samples(hass, runtime_data):
+    """Test that hours after the first live sample are not folded again."""
+    first_live = dt_util.utcnow() - timedelta(hours=48, minutes=30)
+    runtime_data.forecast_store.record(
+        POOL.key, OccupancyData(100, 100, 50.0), first_live
+    )
+
+    await backfill.async_backfill_area(hass, runtime_data, POOL, days=30)
+
+    assert _forecast_samples(runtime_data) == 1 + RECORDED_HOURS - 48
@@ -0,0 +1,52 @@
+"""Tests for the Phoenix-Bad response cache."""
+
+import pytest
+from custom_components.phoenix_bad import cache as cache_module
+from custom_components.phoenix_bad.cache import ResponseCache
+
+
+def test_cache_hit_and_expiry(monkeypatch):
+    """Test that entries are served until their TTL expires."""
+    now = 100.0
+    monkeypatch.setattr(cache_module.time, "monotonic", lambda: now)
+    cache: ResponseCache[str] = ResponseCache()
+
+    cache.set("pool", "data", ttl=60)
+    assert cache.get("pool") == "data"
+
+    now = 161.0
+    assert cache.get("pool") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_lru_eviction():
+    """Test that the least recently used entry is evicted first."""
+    cache: ResponseCache[int] = ResponseCache(max_entries=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+
+def test_cache_invalidate():
+    """Test explicit invalidation of single entries and the whole cache."""
+    cache: ResponseCache[int] = ResponseCache()
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.invalidate()
+    assert len(cache) == 0
+
+
+def test_cache_rejects_invalid_size():
+    """Test that a cache without capacity is rejected."""
+    with pytest.raises(ValueError):
+        ResponseCache(max_entries=0)
@@ -0,0 +1,85 @@
+"""Tests for the Phoenix-Bad options flow."""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+import voluptuous as vol
+from homeassistant.data_entry_flow import FlowResultType
+
+from custom_components.phoenix_bad.const import (
+    CONF_OPENING_HOURS,
+    CONF_RETRY_ATTEMPTS,
+    CONF_SCAN_INTERVAL,
+    CONF_STALE_GRACE,
+    CONF_TIMEOUT,
+    DOMAIN,
+    MAX_TIMEOUT,
+)
+
+OPENING_HOURS = "mon-fri 07:00-22:00; sat,sun 08:00-20:00"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("key", "value"),
+    [
+        (CONF_SCAN_INTERVAL, 1),
+        (CONF_TIMEOUT, MAX_TIMEOUT + 1),
+        (CONF_RETRY_ATTEMPTS, 0),
+        (CONF_STALE_GRACE, -1),
+    ],
+)
+async def test_out_of_range_options_are_rejected(hass, integration, key, value):
+    """Test that values outside an option's bounds are not accepted."""
+    result = await hass.config_entries.options.async_init(integration.entry_id)
+
+    with pytest.raises(vol.Invalid):
+        await hass.config_entries.options.async_configure(
+            result["flow_id"], {key: value}
+        )
+    assert key not in integration.options
+
+
+@pytest.mark.asyncio
+async def test_invalid_opening_hours_are_shown_as_error(hass, integration):
+    """Test that unparsable opening hours return to the form with an error."""
+    result = await hass.config_entries.options.async_init(integration.entry_id)
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], {CONF_OPENING_HOURS: "someday 25:00-26:00"}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {CONF_OPENING_HOURS: "invalid_opening_hours"}
+    assert CONF_OPENING_HOURS not in integration.options
+
+
+@pytest.mark.asyncio
+async def test_saved_options_apply_without_reload(hass, integration):
+    """Test that saved options reach the client and coordinators in place."""
+    runtime_data = hass.data[DOMAIN][integration.entry_id]
+    result = await hass.config_entries.options.async_init(integration.entry_id)
+
+    with patch.object(hass.config_entries, "async_reload") as reload:
+        result = await hass.config_entries.options.async_configure(
+            result["flow_id"],
+            {
+                CONF_SCAN_INTERVAL: 10,
+                CONF_OPENING_HOURS: f"  {OPENING_HOURS} ",
+                CONF_TIMEOUT: 20,
+                CONF_RETRY_ATTEMPTS: 2,
+                CONF_STALE_GRACE: 45,
+            },
+        )
+        await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert integration.options[CONF_OPENING_HOURS] == OPENING_HOURS
+    reload.assert_not_called()
+    assert runtime_data.api.timeout == 20
+    assert runtime_data.api.retry_policy.connection_attempts == 2
+    for coordinator in runtime_data.coordinators.values():
+        assert coordinator.stale_grace == timedelta(minutes=45)
+        assert coordinator.scheduler.open_interval == timedelta(minutes=10)
+        assert coordinator.scheduler.opening_hours is not None
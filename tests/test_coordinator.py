@@ -0,0 +1,188 @@
+"""Tests for the Phoenix-Bad coordinator."""
+
+from collections.abc import Iterable
+from datetime import timedelta
+
+import pytest
+from homeassistant.util import dt as dt_util
+
+from custom_components.phoenix_bad.api import (
+    AREAS,
+    Area,
+    OccupancyData,
+    PhoenixBadApiClient,
+    PhoenixBadConnectionError,
+)
+from custom_components.phoenix_bad.const import CONF_OCCUPANCY_DEADBAND
+from custom_components.phoenix_bad.coordinator import (
+    PhoenixBadCoordinator,
+    PhoenixBadRuntimeData,
+)
+
+POOL, SAUNA = AREAS
+SCAN_INTERVAL = timedelta(minutes=5)
+
+
+class FakeApi:
+    """API client serving settable samples instead of fetching them."""
+
+    def __init__(self, **samples: OccupancyData) -> None:
+        """Initialize the client with the sample of each area key."""
+        self.samples = samples
+        self.failing: set[str] = set()
+
+    async def get_all_occupancy(
+        self, areas: Iterable[Area] = AREAS
+    ) -> dict[str, OccupancyData]:
+        """Return the samples of the areas that are not failing."""
+        result = {
+            area.key: self.samples[area.key]
+            for area in areas
+            if area.key not in self.failing
+        }
+        if not result:
+            raise PhoenixBadConnectionError("Failed to fetch data for all areas")
+        return result
+
+
+def _coordinator(hass, api, **kwargs) -> PhoenixBadCoordinator:
+    """Return a coordinator with a fixed interval around a fake client."""
+    return PhoenixBadCoordinator(
+        hass, None, scan_interval=SCAN_INTERVAL, api=api, **kwargs
+    )
+
+
+def _count_updates(coordinator: PhoenixBadCoordinator, request) -> list[None]:
+    """Record listener calls until the end of the test."""
+    calls: list[None] = []
+    request.addfinalizer(coordinator.async_add_listener(lambda: calls.append(None)))
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_listeners_are_only_notified_of_changes(hass, request):
+    """Test that an unchanged refresh is counted but not published."""
+    api = FakeApi(pool=OccupancyData(100, 50, 33.33))
+    coordinator = _coordinator(hass, api, areas=(POOL,))
+    calls = _count_updates(coordinator, request)
+
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+    assert len(calls) == 1
+    assert coordinator.suppressed_updates == 1
+
+    api.samples["pool"] = OccupancyData(90, 60, 40.0)
+    await coordinator.async_refresh()
+    assert len(calls) == 2
+    assert coordinator.data["pool"] == OccupancyData(90, 60, 40.0)
+
+
+@pytest.mark.asyncio
+async def test_changes_within_the_deadband_are_not_published(hass, request):
+    """Test that the previous sample is kept while within the deadband."""
+    api = FakeApi(pool=OccupancyData(100, 50, 33.0))
+    coordinator = _coordinator(hass, api, areas=(POOL,), deadbands={"percentage": 2})
+    calls = _count_updates(coordinator, request)
+    await coordinator.async_refresh()
+
+    api.samples["pool"] = OccupancyData(100, 50, 34.5)
+    await coordinator.async_refresh()
+    assert len(calls) == 1
+    assert coordinator.data["pool"].percentage == 33.0
+
+    api.samples["pool"] = OccupancyData(100, 50, 36.0)
+    await coordinator.async_refresh()
+    assert len(calls) == 2
+    assert coordinator.data["pool"].percentage == 36.0
+
+
+@pytest.mark.asyncio
+async def test_deadband_option_reaches_the_coordinators(hass):
+    """Test that the occupancy deadband option sets the percentage deadband."""
+    coordinator = _coordinator(hass, FakeApi(), areas=(POOL,))
+    runtime_data = PhoenixBadRuntimeData(
+        api=PhoenixBadApiClient(), coordinators={"pool": coordinator}
+    )
+
+    runtime_data.apply_options({CONF_OCCUPANCY_DEADBAND: 1.5})
+    assert OccupancyData(100, 50, 33.3).is_close(
+        OccupancyData(98, 52, 34.7), coordinator.deadbands
+    )
+    assert not OccupancyData(100, 50, 33.3).is_close(
+        OccupancyData(97, 53, 35.3), coordinator.deadbands
+    )
+
+    runtime_data.apply_options({})
+    assert coordinator.deadbands == {}
+
+
+@pytest.mark.asyncio
+async def test_restore_only_seeds_own_areas_and_marks_them_stale(hass):
+    """Test that restored data is filtered by area and marked stale."""
+    fetched_at = dt_util.utcnow() - timedelta(minutes=10)
+    coordinator = _coordinator(hass, FakeApi(), areas=(POOL,))
+
+    coordinator.restore(
+        {
+            "pool": (OccupancyData(100, 50, 33.33), fetched_at),
+            "sauna": (OccupancyData(20, 10, 33.33), fetched_at),
+        }
+    )
+
+    assert coordinator.data == {"pool": OccupancyData(100, 50, 33.33)}
+    assert coordinator.last_fetched == {"pool": fetched_at}
+    assert coordinator.stale_areas == {"pool"}
+
+
+@pytest.mark.asyncio
+async def test_live_refresh_clears_the_stale_flag(hass, request):
+    """Test that listeners hear about a stale flag clearing on equal data."""
+    sample = OccupancyData(100, 50, 33.33)
+    coordinator = _coordinator(hass, FakeApi(pool=sample), areas=(POOL,))
+    coordinator.restore({"pool": (sample, dt_util.utcnow())})
+    calls = _count_updates(coordinator, request)
+
+    await coordinator.async_refresh()
+
+    assert coordinator.stale_areas == set()
+    assert len(calls) == 1
+    assert coordinator.suppressed_updates == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_area_is_served_stale_until_the_grace_expires(hass):
+    """Test that the last good data outlives failures only within the grace."""
+    api = FakeApi(pool=OccupancyData(100, 50, 33.33))
+    coordinator = _coordinator(
+        hass, api, areas=(POOL,), stale_grace=timedelta(minutes=30)
+    )
+    await coordinator.async_refresh()
+
+    api.failing.add("pool")
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.stale_areas == {"pool"}
+    assert coordinator.data["pool"] == OccupancyData(100, 50, 33.33)
+    assert coordinator.suppressed_updates == 0
+
+    coordinator.last_fetched["pool"] -= timedelta(minutes=31)
+    await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+
+@pytest.mark.asyncio
+async def test_failing_area_does_not_affect_other_coordinators(hass):
+    """Test that each area's coordinator succeeds or fails on its own."""
+    api = FakeApi(
+        pool=OccupancyData(100, 50, 33.33), sauna=OccupancyData(20, 10, 33.33)
+    )
+    api.failing.add("sauna")
+    pool = _coordinator(hass, api, areas=(POOL,))
+    sauna = _coordinator(hass, api, areas=(SAUNA,))
+
+    await pool.async_refresh()
+    await sauna.async_refresh()
+
+    assert pool.last_update_success
+    assert pool.data == {"pool": OccupancyData(100, 50, 33.33)}
+    assert not sauna.last_update_success
@@ -0,0 +1,74 @@
+"""End-to-end tests of the API client against the local stand-in server."""
+
+import asyncio
+
+import pytest
+
+from custom_components.phoenix_bad.api import (
+    PhoenixBadApiClient,
+    PhoenixBadCircuitOpenError,
+    PhoenixBadConnectionError,
+)
+from custom_components.phoenix_bad.resilience import NO_RETRY
+from tests.stand_in_server import StandInServer, closed_curve, constant_curve
+
+
+@pytest.mark.asyncio
+async def test_client_against_stand_in_server():
+    """Test parsing, closed areas and conditional GETs end to end."""
+    server = StandInServer({"Bad": constant_curve(10, 50.0), "Sauna": closed_curve()})
+    async with server, PhoenixBadApiClient(api_url=server.api_url) as client:
+        first = await client.get_all_occupancy()
+        second = await client.get_all_occupancy()
+
+    assert first["pool"].free == 10
+    assert first["pool"].occupied == 10
+    assert first["sauna"].total == 0
+    assert second == first
+    assert server.not_modified == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_requests():
+    """Test that a burst of callers costs one request per area."""
+    async with (
+        StandInServer(latency=0.05) as server,
+        PhoenixBadApiClient(api_url=server.api_url) as client,
+    ):
+        results = await asyncio.gather(*(client.get_all_occupancy() for _ in range(50)))
+
+    assert server.requests == 2
+    assert all(result == results[0] for result in results)
+
+
+@pytest.mark.asyncio
+async def test_failing_server_opens_circuit():
+    """Test that a consistently failing upstream is cut off."""
+    async with (
+        StandInServer(error_rate=1.0) as server,
+        PhoenixBadApiClient(
+            api_url=server.api_url,
+            retry_policy=NO_RETRY,
+            circuit_failure_threshold=2,
+        ) as client,
+    ):
+        for _ in range(2):
+            with pytest.raises(PhoenixBadConnectionError):
+                await client.get_pool_occupancy()
+        with pytest.raises(PhoenixBadCircuitOpenError):
+            await client.get_pool_occupancy()
+
+    assert server.requests == 2
+
+
+@pytest.mark.asyncio
+async def test_slow_drip_body():
+    """Test that bodies trickling in small chunks are read completely."""
+    async with (
+        StandInServer(drip_delay=0.001, drip_chunk_size=8) as server,
+        PhoenixBadApiClient(api_url=server.api_url) as client,
+    ):
+        data = await client.get_sauna_occupancy()
+
+    assert data.free == 41
+    assert data.percentage == 31.67
@@ -0,0 +1,65 @@
+"""Tests for the Phoenix-Bad occupancy forecast."""
+
+from datetime import datetime
+
+from custom_components.phoenix_bad.api import OccupancyData
+from custom_components.phoenix_bad.forecast import (
+    CELLS,
+    ForecastCell,
+    ForecastMatrix,
+    OccupancyForecast,
+    slot_index,
+)
+
+# A Saturday
+SATURDAY_5PM = datetime(2024, 5, 11, 17, 0)
+
+
+def _open(percentage: float) -> OccupancyData:
+    """Return an open area sample with the given percentage."""
+    return OccupancyData(free=100, occupied=100, percentage=percentage)
+
+
+def test_slot_index():
+    """Test that weekday and half-hour select the cell."""
+    assert slot_index(datetime(2024, 5, 6, 0, 0)) == 0
+    assert slot_index(datetime(2024, 5, 6, 0, 29)) == 0
+    assert slot_index(datetime(2024, 5, 6, 0, 30)) == 1
+    assert slot_index(datetime(2024, 5, 12, 23, 59)) == CELLS - 1
+
+
+def test_mean_and_quantiles():
+    """Test running mean, histogram quantiles and sample count of a cell."""
+    forecast = OccupancyForecast()
+    for minute, percentage in enumerate((10, 20, 30, 40, 50, 60, 70, 80, 90, 100)):
+        forecast.add("pool", SATURDAY_5PM.replace(minute=minute), _open(percentage))
+
+    cell = forecast.at("pool", SATURDAY_5PM.replace(minute=29))
+    assert cell.samples == 10
+    assert cell.mean == 55.0
+    assert cell.p10 == 15.0
+    assert cell.p50 == 55.0
+    assert cell.p90 == 95.0
+    # Other slots and areas are unaffected
+    assert forecast.at("pool", SATURDAY_5PM.replace(minute=30)).samples == 0
+    assert forecast.at("sauna", SATURDAY_5PM) == ForecastCell(0, None, None, None, None)
+
+
+def test_closed_samples_are_skipped():
+    """Test that samples of a closed area do not enter the forecast."""
+    forecast = OccupancyForecast()
+    assert not forecast.add("pool", SATURDAY_5PM, OccupancyData(0, 0, 0.0))
+    assert forecast.at("pool", SATURDAY_5PM).samples == 0
+
+
+def test_round_trip_and_incompatible_storage():
+    """Test serialization and that malformed areas start empty."""
+    forecast = OccupancyForecast()
+    forecast.add("pool", SATURDAY_5PM, _open(42.5))
+
+    restored = OccupancyForecast.from_dict(
+        {**forecast.as_dict(), "sauna": {"counts": [1, 2]}}
+    )
+    assert restored.at("pool", SATURDAY_5PM) == forecast.at("pool", SATURDAY_5PM)
+    assert "sauna" not in restored.matrices
+    assert isinstance(restored.matrices["pool"], ForecastMatrix)
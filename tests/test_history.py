@@ -0,0 +1,112 @@
+"""Tests for the Phoenix-Bad binary occupancy history."""
+
+import pytest
+from custom_components.phoenix_bad.history import (
+    HEADER,
+    RECORD,
+    HistoryRecord,
+    OccupancyHistory,
+)
+
+
+def _records(start: int, stop: int) -> list[HistoryRecord]:
+    """Return one record per second with the timestamp as free count."""
+    return [HistoryRecord(float(ts), ts, 100 - ts, 0.5) for ts in range(start, stop)]
+
+
+def test_append_and_read_back(tmp_path):
+    """Test that appended batches read back in order."""
+    history = OccupancyHistory(tmp_path / "pool.history", capacity=16)
+    history.append(_records(0, 5))
+    history.append(_records(5, 8))
+
+    with history.reader() as reader:
+        assert len(reader) == 8
+        assert list(reader.records()) == _records(0, 8)
+
+
+def test_ring_wraps_with_fixed_size(tmp_path):
+    """Test that the oldest records are overwritten and the file never grows."""
+    path = tmp_path / "pool.history"
+    history = OccupancyHistory(path, capacity=10)
+    for start in range(0, 37, 6):
+        history.append(_records(start, start + 6))
+
+    assert path.stat().st_size == HEADER.size + 10 * RECORD.size
+    with history.reader() as reader:
+        assert len(reader) == 10
+        assert list(reader.records()) == _records(32, 42)
+        # The wrapped range is served as two zero-copy segments
+        segments = reader.segments()
+        assert [len(view) // RECORD.size for view in segments] == [8, 2]
+        for view in segments:
+            view.release()
+
+
+def test_crash_while_wrapping_keeps_only_intact_records(tmp_path, monkeypatch):
+    """Test that records being overwritten are dropped before the write."""
+    history = OccupancyHistory(tmp_path / "pool.history", capacity=10)
+    history.append(_records(0, 8))
+    write_header = history._write_header
+    calls = []
+
+    def _crash_after_first_header(file, head, count):
+        calls.append((head, count))
+        if len(calls) > 1:
+            raise OSError("Simulated crash")
+        write_header(file, head, count)
+
+    monkeypatch.setattr(history, "_write_header", _crash_after_first_header)
+    with pytest.raises(OSError):
+        history.append(_records(8, 14))
+
+    # The new records are written but the final header is not, so the
+    # ring holds the old records the batch did not reach
+    with history.reader() as reader:
+        assert list(reader.records()) == _records(4, 8)
+
+
+def test_time_range_slicing(tmp_path):
+    """Test that start is inclusive and end exclusive across the wrap."""
+    history = OccupancyHistory(tmp_path / "pool.history", capacity=10)
+    history.append(_records(0, 14))
+
+    with history.reader() as reader:
+        assert list(reader.records(6, 11)) == _records(6, 11)
+        assert list(reader.records(start=12.5)) == _records(13, 14)
+        assert list(reader.records(end=0)) == []
+
+
+def test_missing_or_incompatible_file(tmp_path):
+    """Test that a missing file reads as empty and another capacity resets."""
+    path = tmp_path / "pool.history"
+    with OccupancyHistory(path).reader() as reader:
+        assert len(reader) == 0
+
+    OccupancyHistory(path, capacity=4).append(_records(0, 3))
+    history = OccupancyHistory(path, capacity=8)
+    with history.reader() as reader:
+        assert len(reader) == 0
+    history.append(_records(3, 4))
+    with history.reader() as reader:
+        assert list(reader.records()) == _records(3, 4)
+
+    with pytest.raises(ValueError):
+        OccupancyHistory(path, capacity=0)
+
+
+def test_backfill_inserts_only_older_records(tmp_path):
+    """Test that backfilled records go before the existing history."""
+    history = OccupancyHistory(tmp_path / "pool.history", capacity=10)
+    assert history.oldest_timestamp() is None
+    history.append(_records(6, 10))
+
+    assert history.backfill(_records(0, 8)) == 6
+    assert history.oldest_timestamp() == 0.0
+    # The ring keeps accepting new records after the rewrite
+    history.append(_records(10, 12))
+    with history.reader() as reader:
+        assert list(reader.records()) == _records(2, 12)
+
+    assert history.backfill(_records(0, 5)) == 0
+    assert not (tmp_path / "pool.history.tmp").exists()
@@ -0,0 +1,43 @@
+"""Tests for Phoenix-Bad request metrics."""
+
+from custom_components.phoenix_bad.metrics import (
+    BUCKET_BOUNDS_MS,
+    LatencyHistogram,
+    RequestMetrics,
+)
+
+
+def test_histogram_is_fixed_size():
+    """Test that observations never grow the histogram."""
+    histogram = LatencyHistogram()
+    for index in range(10000):
+        histogram.observe(index / 1000)
+
+    assert len(histogram.counts) == len(BUCKET_BOUNDS_MS) + 1
+    assert histogram.count == 10000
+    assert sum(histogram.counts) == 10000
+
+
+def test_histogram_percentiles():
+    """Test bucket based percentile estimates."""
+    histogram = LatencyHistogram()
+    for _ in range(90):
+        histogram.observe(0.004)
+    for _ in range(10):
+        histogram.observe(0.150)
+
+    assert histogram.percentile(0.5) == 5
+    assert histogram.percentile(0.95) == 150
+    assert LatencyHistogram().percentile(0.5) is None
+
+
+def test_request_metrics_as_dict():
+    """Test the diagnostics summary of request metrics."""
+    metrics = RequestMetrics()
+    metrics.observe("Pool", "parse", 0.0005)
+
+    summary = metrics.as_dict()
+
+    assert summary["Pool"]["parse"]["count"] == 1
+    assert summary["Pool"]["parse"]["buckets"]["le_1ms"] == 1
+    assert summary["Pool"]["dns"]["count"] == 0
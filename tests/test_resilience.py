@@ -0,0 +1,70 @@
+"""Tests for the Phoenix-Bad retry, circuit breaker and rate limiting policies."""
+
+from custom_components.phoenix_bad import resilience
+from custom_components.phoenix_bad.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    RetryPolicy,
+    TokenBucket,
+)
+
+
+def test_retry_delay_backoff_and_jitter():
+    """Test that delays grow exponentially, are capped and jittered."""
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, jitter=0.5)
+
+    for attempt, backoff in ((1, 1.0), (2, 2.0), (3, 4.0), (4, 5.0), (10, 5.0)):
+        delay = policy.delay(attempt)
+        assert backoff * 0.5 <= delay <= backoff
+
+
+def test_circuit_breaker_opens_and_probes(monkeypatch):
+    """Test the closed -> open -> half-open -> closed cycle."""
+    now = 0.0
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now)
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+
+    breaker.record_failure()
+    assert breaker.state is CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+    assert not breaker.allow_request()
+
+    now = 61.0
+    assert breaker.state is CircuitState.HALF_OPEN
+    assert breaker.allow_request()
+    # Only one probe is let through while half-open
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state is CircuitState.CLOSED
+    assert breaker.allow_request()
+
+
+def test_circuit_breaker_failed_probe_reopens(monkeypatch):
+    """Test that a failed probe re-opens the circuit immediately."""
+    now = 0.0
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now)
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+    breaker.record_failure()
+
+    now = 61.0
+    assert breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state is CircuitState.OPEN
+
+
+def test_token_bucket_queues_beyond_burst(monkeypatch):
+    """Test that requests beyond the burst wait for their refilled token."""
+    now = 0.0
+    monkeypatch.setattr(resilience.time, "monotonic", lambda: now)
+    bucket = TokenBucket(rate=2.0, burst=2)
+
+    assert bucket.reserve() == 0
+    assert bucket.reserve() == 0
+    # Excess requests queue up behind each other instead of being rejected
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+
+    now = 2.0
+    assert bucket.reserve() == 0
@@ -0,0 +1,176 @@
+"""Tests for the Phoenix-Bad adaptive polling scheduler."""
+
+from datetime import datetime, time, timedelta
+
+import pytest
+from custom_components.phoenix_bad.api import OccupancyData
+from custom_components.phoenix_bad.const import (
+    CLOSED_SCAN_INTERVAL,
+    DEFAULT_SCAN_INTERVAL,
+    MAX_CLOSED_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    OPEN_SCAN_INTERVAL,
+)
+from custom_components.phoenix_bad.scheduler import (
+    AdaptiveScheduler,
+    OpeningHours,
+    install_phase,
+    parse_opening_hours,
+    parse_opening_hours_text,
+)
+
+# A Wednesday
+MIDDAY = datetime(2024, 5, 8, 12, 0)
+CLOSED = OccupancyData(free=0, occupied=0, percentage=0.0)
+HOURS = OpeningHours.from_text("mon-fri 07:00-22:00; sat,sun 08:00-20:00")
+
+
+def _open(percentage: float) -> OccupancyData:
+    """Return an open area sample with the given percentage."""
+    occupied = round(percentage)
+    return OccupancyData(free=100 - occupied, occupied=occupied, percentage=percentage)
+
+
+def test_parse_opening_hours():
+    """Test parsing of split days, closed days and invalid periods."""
+    table = parse_opening_hours({"mon": "07:00-12:00, 14:00-22:00", "tue": ""})
+    assert table[0] == ((time(7), time(12)), (time(14), time(22)))
+    assert table[1] == table[6] == ()
+
+    with pytest.raises(ValueError):
+        parse_opening_hours({"mon": "22:00-07:00"})
+    with pytest.raises(ValueError):
+        parse_opening_hours({"monday": "07:00-22:00"})
+
+
+def test_parse_opening_hours_text():
+    """Test day ranges, lists, wrap-around and invalid opening hours text."""
+    assert parse_opening_hours_text(
+        "mon-wed 07:00-22:00; sat,sun 08:00-12:00, 14:00-20:00"
+    ) == {
+        "mon": "07:00-22:00",
+        "tue": "07:00-22:00",
+        "wed": "07:00-22:00",
+        "sat": "08:00-12:00, 14:00-20:00",
+        "sun": "08:00-12:00, 14:00-20:00",
+    }
+    assert set(parse_opening_hours_text("sat-mon 09:00-18:00")) == {"sat", "sun", "mon"}
+    assert OpeningHours.from_text("  ") is None
+
+    for text in ("monday 07:00-22:00", "mon", "mon 25:00-26:00", "mon 22:00-07:00"):
+        with pytest.raises(ValueError):
+            parse_opening_hours_text(text)
+
+
+def test_next_opening_skips_closed_days():
+    """Test that the next opening is found across closed days."""
+    hours = OpeningHours({"mon": "07:00-22:00"})
+
+    assert hours.is_open(datetime(2024, 5, 6, 7, 0))
+    assert not hours.is_open(datetime(2024, 5, 6, 22, 0))
+    assert hours.next_opening(datetime(2024, 5, 6, 23, 0)) == datetime(
+        2024, 5, 13, 7, 0
+    )
+    assert OpeningHours({}).next_opening(MIDDAY) is None
+
+
+def test_sleeps_until_opening():
+    """Test that polls outside opening hours wait for the next opening."""
+    scheduler = AdaptiveScheduler(HOURS)
+
+    night = datetime(2024, 5, 8, 23, 0)
+    assert scheduler.next_interval(night, {"pool": CLOSED}) == timedelta(hours=8)
+    # Never sleep for less than the minimum or longer than the maximum
+    just_before = datetime(2024, 5, 8, 6, 59)
+    assert scheduler.next_interval(just_before, None) == MIN_SCAN_INTERVAL
+    never_open = AdaptiveScheduler(OpeningHours({}))
+    assert never_open.next_interval(MIDDAY, None) == MAX_SCAN_INTERVAL
+
+
+def test_polls_around_the_clock_without_opening_hours():
+    """Test the default interval and no speed-up without opening hours."""
+    scheduler = AdaptiveScheduler()
+
+    assert scheduler.next_interval(MIDDAY, None) == DEFAULT_SCAN_INTERVAL
+    assert scheduler.next_interval(MIDDAY, {"pool": _open(40)}) == DEFAULT_SCAN_INTERVAL
+    later = MIDDAY + DEFAULT_SCAN_INTERVAL
+    assert scheduler.next_interval(later, {"pool": _open(90)}) == DEFAULT_SCAN_INTERVAL
+
+
+def test_closed_areas_back_off_exponentially():
+    """Test that the interval doubles while every area keeps reporting closed."""
+    scheduler = AdaptiveScheduler()
+    data = {"pool": CLOSED, "sauna": CLOSED}
+
+    intervals = [scheduler.next_interval(MIDDAY, data) for _ in range(5)]
+    assert intervals == [
+        CLOSED_SCAN_INTERVAL,
+        2 * CLOSED_SCAN_INTERVAL,
+        MAX_CLOSED_SCAN_INTERVAL,
+        MAX_CLOSED_SCAN_INTERVAL,
+        MAX_CLOSED_SCAN_INTERVAL,
+    ]
+    # An open area starts the backoff over
+    assert scheduler.next_interval(MIDDAY, {"pool": _open(40)}) == DEFAULT_SCAN_INTERVAL
+    assert scheduler.next_interval(MIDDAY, data) == CLOSED_SCAN_INTERVAL
+
+
+def test_backs_off_when_closed_during_opening_hours():
+    """Test the long idle interval when every area reports closed."""
+    scheduler = AdaptiveScheduler(HOURS)
+    data = {"pool": CLOSED, "sauna": CLOSED}
+
+    assert scheduler.next_interval(MIDDAY, data) == CLOSED_SCAN_INTERVAL
+    assert scheduler.next_interval(MIDDAY, None) == OPEN_SCAN_INTERVAL
+
+
+def test_polls_faster_when_occupancy_changes_quickly():
+    """Test that the interval follows the rate of occupancy change."""
+    scheduler = AdaptiveScheduler(HOURS)
+    assert scheduler.next_interval(MIDDAY, {"pool": _open(40)}) == OPEN_SCAN_INTERVAL
+
+    # 4 points in 15 minutes: aim for 2 points per poll
+    later = MIDDAY + OPEN_SCAN_INTERVAL
+    data = {"pool": _open(44), "sauna": CLOSED}
+    assert scheduler.next_interval(later, data) == timedelta(minutes=7.5)
+
+    # A rush would go below the minimum interval
+    rush = later + timedelta(minutes=5)
+    assert scheduler.next_interval(rush, {"pool": _open(64)}) == MIN_SCAN_INTERVAL
+
+    # Steady occupancy relaxes back to the open interval
+    steady = rush + MIN_SCAN_INTERVAL
+    assert scheduler.next_interval(steady, {"pool": _open(64)}) == OPEN_SCAN_INTERVAL
+
+
+def test_default_schedule_polls_no_more_than_hourly_over_a_day():
+    """Test that a simulated day costs no more polls than the fixed interval."""
+    scheduler = AdaptiveScheduler(phase=install_phase("entry:pool"))
+    start = datetime(2024, 5, 8, 0, 0)
+    now, polls = start, 0
+    while now < start + timedelta(days=1):
+        hour = now.hour + now.minute / 60
+        # Open 07-22 with occupancy swinging by up to 60 points
+        sample = _open(20 + 60 * abs(15 - hour) / 8) if 7 <= hour < 22 else CLOSED
+        now += scheduler.next_interval(now, {"pool": sample})
+        polls += 1
+
+    assert polls <= timedelta(days=1) / DEFAULT_SCAN_INTERVAL
+
+
+def test_phase_spreads_polls_over_the_interval():
+    """Test that polls land on the install's offset within the interval."""
+    phase = install_phase("entry:bad")
+    assert phase == install_phase("entry:bad")
+    assert phase != install_phase("other:bad")
+
+    scheduler = AdaptiveScheduler(phase=0.25)
+    period = DEFAULT_SCAN_INTERVAL.total_seconds()
+    interval = scheduler.next_interval(MIDDAY, None)
+
+    assert period / 2 <= interval.total_seconds() < 1.5 * period
+    assert (MIDDAY + interval).timestamp() % period == pytest.approx(0.25 * period)
+
+    with pytest.raises(ValueError):
+        AdaptiveScheduler(phase=1.0)
@@ -0,0 +1,73 @@
+"""Tests for the Phoenix-Bad sensor platform."""
+
+import pytest
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.phoenix_bad.const import DOMAIN
+
+POOL_OCCUPANCY = "sensor.occupancy_data_pool_occupancy"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("entity_id", "unique_id", "state"),
+    [
+        (POOL_OCCUPANCY, "phoenixbad_pool_occupancy", "40"),
+        ("sensor.occupancy_data_pool_free_places", "phoenixbad_pool_free", "120"),
+        (
+            "sensor.occupancy_data_pool_occupied_places",
+            "phoenixbad_pool_occupied",
+            "80",
+        ),
+        ("sensor.occupancy_data_pool_total_places", "phoenixbad_pool_total", "200"),
+        ("sensor.occupancy_data_sauna_occupancy", "phoenixbad_sauna_occupancy", "25"),
+        ("sensor.occupancy_data_sauna_free_places", "phoenixbad_sauna_free", "30"),
+        (
+            "sensor.occupancy_data_sauna_occupied_places",
+            "phoenixbad_sauna_occupied",
+            "10",
+        ),
+        ("sensor.occupancy_data_sauna_total_places", "phoenixbad_sauna_total", "40"),
+    ],
+)
+async def test_sensors_are_created_for_every_area(
+    hass, integration, entity_id, unique_id, state
+):
+    """Test the entity ID, unique ID and state of each area's sensors."""
+    entry = er.async_get(hass).async_get(entity_id)
+    assert entry is not None
+    assert entry.unique_id == unique_id
+    assert entry.config_entry_id == integration.entry_id
+    assert hass.states.get(entity_id).state == state
+
+
+@pytest.mark.asyncio
+async def test_occupancy_sensors_keep_the_deprecated_attributes(hass, integration):
+    """Test that the occupancy sensors still report free and occupied places."""
+    attributes = hass.states.get(POOL_OCCUPANCY).attributes
+    assert attributes["free"] == 120
+    assert attributes["occupied"] == 80
+    assert (
+        "free"
+        not in hass.states.get("sensor.occupancy_data_pool_free_places").attributes
+    )
+
+
+@pytest.mark.asyncio
+async def test_fetch_time_is_only_shown_while_stale(hass, integration, occupancy):
+    """Test that an unchanged refresh does not leave a misleading fetch time."""
+    coordinator = hass.data[DOMAIN][integration.entry_id].coordinators["pool"]
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.suppressed_updates == 1
+    state = hass.states.get(POOL_OCCUPANCY)
+    assert state.attributes["stale"] is False
+    assert "last_fetched" not in state.attributes
+
+    del occupancy["pool"]
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(POOL_OCCUPANCY)
+    assert state.attributes["stale"] is True
+    assert state.attributes["last_fetched"] == coordinator.last_fetched["pool"]
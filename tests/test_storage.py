@@ -0,0 +1,61 @@
+"""Tests for persisting the last known Phoenix-Bad occupancy."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.phoenix_bad.api import OccupancyData
+from custom_components.phoenix_bad.storage import (
+    OccupancySnapshotStore,
+    snapshot_from_dict,
+    snapshot_to_dict,
+)
+
+FETCHED_AT = datetime(2024, 5, 4, 14, 30, tzinfo=UTC)
+STALE_GRACE = timedelta(minutes=30)
+
+
+def test_snapshot_round_trip():
+    """Test that a serialized snapshot loads back unchanged."""
+    snapshot = {
+        "pool": (OccupancyData(free=183, occupied=115, percentage=38.59), FETCHED_AT),
+        "sauna": (OccupancyData(free=41, occupied=19, percentage=31.67), FETCHED_AT),
+    }
+
+    assert snapshot_from_dict(snapshot_to_dict(snapshot)) == snapshot
+
+
+def test_snapshot_skips_malformed_areas():
+    """Test that corrupt entries are dropped instead of failing the load."""
+    stored = snapshot_to_dict(
+        {"pool": (OccupancyData(free=1, occupied=2, percentage=66.67), FETCHED_AT)}
+    )
+    stored["areas"]["sauna"] = {"free": "n/a", "occupied": 0, "percentage": 0}
+    stored["areas"]["spa"] = {"free": 1, "occupied": 1, "percentage": 50}
+
+    assert set(snapshot_from_dict(stored)) == {"pool"}
+    assert snapshot_from_dict({}) == {}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_snapshot_is_saved_as_its_fetch_time_ages(hass):
+    """Test that confirmed data is rewritten every half stale grace."""
+    store = OccupancySnapshotStore(hass, "test")
+    sample = OccupancyData(free=183, occupied=115, percentage=38.59)
+
+    with patch.object(store._store, "async_delay_save") as delay_save:
+        store.async_save_if_changed({"pool": (sample, FETCHED_AT)}, STALE_GRACE)
+        assert delay_save.call_count == 1
+
+        later = FETCHED_AT + STALE_GRACE / 2 - timedelta(seconds=1)
+        store.async_save_if_changed({"pool": (sample, later)}, STALE_GRACE)
+        assert delay_save.call_count == 1
+
+        later = FETCHED_AT + STALE_GRACE / 2
+        store.async_save_if_changed({"pool": (sample, later)}, STALE_GRACE)
+        assert delay_save.call_count == 2
+        assert snapshot_from_dict(delay_save.call_args.args[0]())["pool"] == (
+            sample,
+            later,
+        )